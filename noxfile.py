@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 import nox
@@ -14,7 +15,7 @@ BENCHMARK_CASES = {
             "flow_data":{   
                 "flow_str": "double_gyre",
                 "grid_shape": (201, 101),
-                'domain': ((0.0, 2.0), (0.0, 1.0)),
+                'domain': [0.0, 2.0, 0.0, 1.0], # [x0, x1, y0, y1]
                 "t0": 0.0,
                 "T": 16.0,
                 "dt0": 0.5
@@ -24,7 +25,21 @@ BENCHMARK_CASES = {
             "error_data": {
                 #"path": os.path.join(BASE_DATA_DIR, "dg_ftle_true.npy"), "t0": 0.5, "T": 16.0
             }, # Make empty dict if not computing error (comment out above line)
-            "pkg_specific_params": {"dynlab": {"num_threads": 8}} # num threads for your hardware
+            # num threads for your hardware, jit_flow=True compiles the flow with numba,
+            # batched=True integrates all grid points together with a shared adaptive step,
+            # single_precision=True (needs batched) integrates the trajectories in float32.
+            # NumbaCS num_workers (int or None) runs the benchmark runs concurrently on that
+            # many single threaded processes (single thread timings, all NumbaCS cases of the
+            # session then use numba's workqueue threading layer), None runs them in turn.
+            # reuse_buffers=True times local buffer reusing versions of the numbacs kernels
+            # instead of numbacs as shipped
+            "pkg_specific_params": {
+                "dynlab": {
+                    "num_threads": 8, "jit_flow": False, "batched": False,
+                    "single_precision": False
+                },
+                "numbacs": {"num_workers": None, "reuse_buffers": False}
+            }
         }
     },
     "qge_ftle": {
@@ -37,7 +52,7 @@ BENCHMARK_CASES = {
                     "u": os.path.join(BASE_DATA_DIR, "qge_u.npy"),
                     "v": os.path.join(BASE_DATA_DIR, "qge_v.npy")
                 },
-                "domain": ((0.0, 1.0), (0.0, 1.0), (0.0, 2.0)),
+                "domain": [0.0, 1.0, 0.0, 1.0, 0.0, 2.0], # [tmin, tmax, x0, x1, y0, y1]
                 "t0": 0.0, 
                 "T": 0.1, 
                 "dt0": 0.01,
@@ -48,7 +63,12 @@ BENCHMARK_CASES = {
                 #"path": os.path.join(BASE_DATA_DIR, "qge_ftle_true.npy"), "t0": 0.01, "T": 0.1
             }, # Make empty dict if not computing error (comment out above line)
             # lcstool wants (t, y, x) axes order, 'dimorder' tells how to permute data for this form
-            "pkg_specific_params": {"lcstool": {"dimorder": [1, 3, 2]}}
+            # vel_dtype ("float32" or None) is the dtype NumbaCS casts the velocity data to,
+            # num_workers and reuse_buffers as for dg_ftle
+            "pkg_specific_params": {
+                "lcstool": {"dimorder": [1, 3, 2]},
+                "numbacs": {"vel_dtype": None, "num_workers": None, "reuse_buffers": False}
+            }
         },
     }
 }
@@ -63,7 +83,10 @@ PACKAGES_CONFIG = {
     },
     "Dynlab": {
         "runner_script": "runners/dynlab_runner.py",
-        "pip_packages": ["dynlab"],
+        # Pinned, the optional batched FTLE (src/benchmarks/dynlab_benchmark_ftle.py) relies
+        # on dynlab's private LagrangianDiagnostic2D, check it before bumping the version.
+        # numexpr is used by the batched double gyre RHS (batched=True), numba by jit_flow=True
+        "pip_packages": ["dynlab==0.1.0", "orjson", "numexpr", "numba"],
         "python_version": "3.13",
         "venv_backend": "conda",
         "supported_cases": ["dg_ftle"]
@@ -85,30 +108,95 @@ PACKAGES_CONFIG = {
 def ensure_results_dir():
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
+def write_temp_run_config(run_config, pkg_name, case_id):
+    """Writes run_config to a temporary JSON file in RESULTS_DIR and returns its path"""
+    with tempfile.NamedTemporaryFile(
+            mode='w', 
+            suffix='.json', 
+            delete=False, 
+            dir=RESULTS_DIR, 
+            prefix=f"cfg_{pkg_name}_{case_id}_"
+        ) as tmp_f:
+        json.dump(run_config, tmp_f, indent=2)
+        
+    return tmp_f.name
+
+def install_signature(pkg_config):
+    """Hash of everything installed into a package session (install specs and pyproject.toml)"""
+    specs = {
+        key: pkg_config.get(key) for key in ("conda_packages", "pip_packages", "dependencies")
+    }
+    sig = hashlib.sha256(json.dumps(specs, sort_keys=True).encode())
+    with open("pyproject.toml", "rb") as f:
+        sig.update(f.read())
+    
+    return sig.hexdigest()
+
+def build_run_config(pkg_name_type, case_id, case_config):
+    """Builds the run config passed to a package runner for a specific case"""
+    output_filename = f"{pkg_name_type.lower()}_{case_id}_results.json"
+    output_json_path_abs = os.path.join(RESULTS_DIR, output_filename)
+    
+    final_run_config = case_config["flow_params"].copy()
+    final_run_config["output_json_path"] = output_json_path_abs
+    
+    final_run_config["metadata"] = {
+        "package_name": pkg_name_type,
+        "case_id": case_id,
+        "case_description": case_config["description"],
+        "case_flow_type": case_config["flow_type"]
+    }
+    
+    return final_run_config
+
 for _pkg_name, _pkg_config in PACKAGES_CONFIG.items():
-    for _case_id, _case_config in BENCHMARK_CASES.items():
-        case_flow_type = _case_config["flow_type"]
+    for _case_id in BENCHMARK_CASES:
         if _case_id not in _pkg_config["supported_cases"]:
             print(
                 f"Skipping {_case_id} benchmark for {_pkg_name} since {_pkg_name} does not "
                 "support this flow or flow type (or the benchmark has not yet been created)."
             )
-            continue
+    
+    _session_name = f"bench-{_pkg_name.lower()}"
+    _py_version = _pkg_config["python_version"]
+    _venv_backend = _pkg_config.get("venv_backend", "venv")
+    
+    # reuse_venv keeps the (conda) env between runs, installs are skipped below if unchanged
+    @nox.session(
+        name=_session_name, python=_py_version, venv_backend=_venv_backend, reuse_venv=True
+    )
+    def benchmark_session(
+            session: nox.Session, 
+            pkg_name=_pkg_name, 
+            pkg_config=_pkg_config
+    ):
+        """Runs benchmarks for all supported cases of a package (or cases passed as posargs)"""
         
-        _session_name = f"bench-{_pkg_name.lower()}-{_case_id}"
-        _py_version = _pkg_config["python_version"]
-        _venv_backend = _pkg_config.get("venv_backend", "venv")
+        supported_cases = [
+            case_id for case_id in BENCHMARK_CASES if case_id in pkg_config["supported_cases"]
+        ]
+        if session.posargs:
+            unsupported = [case_id for case_id in session.posargs if case_id not in supported_cases]
+            if unsupported:
+                session.error(
+                    f"Cases {unsupported} are not supported for {pkg_name}. "
+                    f"Supported cases: {supported_cases}"
+                )
+            case_ids = [case_id for case_id in supported_cases if case_id in session.posargs]
+        else:
+            case_ids = supported_cases
         
-        @nox.session(name=_session_name, python=_py_version, venv_backend=_venv_backend)
-        def benchmark_session(
-                session: nox.Session, 
-                pkg_name=_pkg_name, 
-                pkg_config=_pkg_config, 
-                case_id=_case_id,
-                case_config=_case_config
-        ):
-            """Runs benchmark for specific package-case"""
-            
+        # Marker in the env records what has been installed, a reused env with the same
+        # install specs skips the pip installs and conda solves entirely
+        install_marker = os.path.join(session.virtualenv.location, ".bench_install_sig")
+        sig = install_signature(pkg_config)
+        installed_sig = None
+        if os.path.exists(install_marker):
+            with open(install_marker) as f:
+                installed_sig = f.read().strip()
+        if installed_sig == sig:
+            session.log(f"Reusing environment for {pkg_name}, skipping installs.")
+        else:
             session.install("-e", ".")
             
             if session.venv_backend == "conda":
@@ -122,34 +210,40 @@ for _pkg_name, _pkg_config in PACKAGES_CONFIG.items():
                     session.install(*pkg_config["pip_packages"])
             elif "dependencies" in pkg_config:
                 session.install(*pkg_config["dependencies"])
-            pkg_name_type = pkg_name
-            pkg_name = pkg_name.lower()
-            
-            ensure_results_dir()
-            output_filename = f"{pkg_name}_{case_id}_results.json"
-            output_json_path_abs = os.path.join(RESULTS_DIR, output_filename)
-            
-            final_run_config = case_config["flow_params"].copy()
-            final_run_config["output_json_path"] = output_json_path_abs
-            
-            final_run_config["metadata"] = {
-                "package_name": pkg_name_type,
-                "case_id": case_id,
-                "case_description": case_config["description"],
-                "case_flow_type": case_config["flow_type"]
-            }
-            
-            if pkg_name in ["numbacs", "dynlab"]:
-                run_config_json_str = json.dumps(final_run_config)
+            with open(install_marker, "w") as f:
+                f.write(sig)
+        pkg_name_type = pkg_name
+        pkg_name = pkg_name.lower()
+        
+        ensure_results_dir()
+        
+        if pkg_name in ["numbacs", "dynlab"]:
+            # Run all cases with a single runner process so imports (and numba cache loads)
+            # are only paid once per package
+            run_configs = [
+                build_run_config(pkg_name_type, case_id, BENCHMARK_CASES[case_id])
+                for case_id in case_ids
+            ]
+            temp_run_configs_path = write_temp_run_config(run_configs, pkg_name, "cases")
+            session.log(f"  run_configs for {case_ids} written to: {temp_run_configs_path}")
+            try:
                 session.run(
-                    "python", pkg_config["runner_script"], "--run-config-json", run_config_json_str
+                    "python", pkg_config["runner_script"], 
+                    "--run-configs-json-path", temp_run_configs_path
                 )
-                
-            elif pkg_name == 'lcstool':
-                if not os.getenv("LCSTOOL_PATH"):
-                    session.warn("LCSTOOL_PATH not set. Skipping MATLAB case.")
-                    return
-                
+            finally:
+                if os.path.exists(temp_run_configs_path):
+                    os.remove(temp_run_configs_path)
+            
+        elif pkg_name == 'lcstool':
+            if not os.getenv("LCSTOOL_PATH"):
+                session.warn("LCSTOOL_PATH not set. Skipping MATLAB cases.")
+                return
+            
+            # Each MATLAB case runs in its own MATLAB process
+            for case_id in case_ids:
+                case_config = BENCHMARK_CASES[case_id]
+                final_run_config = build_run_config(pkg_name_type, case_id, case_config)
                 flow_type = case_config["flow_type"]
                 flow_name = final_run_config["flow_data"]["flow_str"]
                 matlab_script_file = pkg_config["matlab_scripts_map"].get(flow_type)
@@ -159,33 +253,28 @@ for _pkg_name, _pkg_config in PACKAGES_CONFIG.items():
                         f"No MATLAB script for {pkg_name} with "
                         f"flow '{flow_name}' ({flow_type}). Skipping."
                     )
-                    return
+                    continue
                 
                 matlab_script_full_path = os.path.join(
                     pkg_config["matlab_scripts_dir"], matlab_script_file
                 )
                 
                 # Write final_run_config to a temporary JSON file for MATLAB
-                with tempfile.NamedTemporaryFile(
-                        mode='w', 
-                        suffix='.json', 
-                        delete=False, 
-                        dir=RESULTS_DIR, 
-                        prefix=f"cfg_{pkg_name}_{case_id}_"
-                    ) as tmp_f:
-                    json.dump(final_run_config, tmp_f, indent=2)
-                    temp_run_config_path_for_matlab = tmp_f.name
+                temp_run_config_path_for_matlab = write_temp_run_config(
+                    final_run_config, pkg_name, case_id
+                )
                 
                 session.log(f"  MATLAB run_config written to: {temp_run_config_path_for_matlab}")
                 try:
                     session.run(
                         "python", pkg_config["runner_script"],
                         "--matlab-script", matlab_script_full_path,
-                        "--run-config-json-path", temp_run_config_path_for_matlab
+                        "--run-config-json-path", temp_run_config_path_for_matlab,
+                        "--iterates", str(final_run_config["iterates_per_run"]),
+                        "--num-runs", str(final_run_config["num_benchmark_runs"])
                     )
                 finally:
                     if os.path.exists(temp_run_config_path_for_matlab):
                         os.remove(temp_run_config_path_for_matlab)
-            else:
-                session.warn(f"Runner logic not defined for package: {pkg_name}")
-            
\ No newline at end of file
+        else:
+            session.warn(f"Runner logic not defined for package: {pkg_name}")
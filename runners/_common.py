@@ -0,0 +1,100 @@
+import json
+import logging
+import logging.handlers
+import os
+import sys
+
+def configure_logging():
+    """
+    Sends benchmark status messages (logged by the benchmarks modules) to a buffered
+    stdout. Records are held in memory and written when a case finishes (see flush_logs),
+    when the buffer fills or on errors, so no console/pipe writes happen during timed runs.
+    """
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=target
+    )
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
+def flush_logs():
+    """Writes out any buffered log records and flushes stdout"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    sys.stdout.flush()
+
+def write_error_json(e, run_config, run_configs_json_path, pkg_label):
+    """Writes an error JSON for a failed benchmark to its output path (or a default)"""
+    print(f"[{pkg_label} Runner] Benchmark FAILED: {type(e).__name__}: {e}", file=sys.stderr)
+    output_path_for_error = f"{pkg_label.lower()}_error.json"
+    # Reuse the already parsed config (if parsing succeeded) to get the output path
+    if isinstance(run_config, dict):
+        output_path_for_error = run_config.get('output_json_path', output_path_for_error)
+
+    error_output = {
+        "package": pkg_label,
+        "error": f"{type(e).__name__}: {e}",
+        "run_configs_json_path_received": run_configs_json_path # Log what was received
+    }
+    try:
+        if output_path_for_error:
+            output_dir = os.path.dirname(output_path_for_error)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            with open(output_path_for_error, 'w') as f:
+                json.dump(error_output, f, indent=2)
+    except Exception:
+        pass
+
+def parse_and_run(args, runner_fn, pkg_label, setup_fn=None):
+    """
+    Parses the run configs JSON once and calls runner_fn on each run config. On failure
+    the error JSON is written from the already parsed config, so the (possibly large)
+    config file is never read again. Exits with status 1 if any case failed.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        parsed arguments, must contain run_configs_json_path.
+    runner_fn : callable
+        function taking a single run config dict.
+    pkg_label : str
+        package name used in messages and the error JSON.
+    setup_fn : callable or None, optional
+        function taking the list of run configs, called once before the first case for
+        process wide setup. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    try:
+        with open(args.run_configs_json_path, 'r') as f_cfg:
+            run_configs = json.load(f_cfg)
+    except Exception as e:
+        write_error_json(e, None, args.run_configs_json_path, pkg_label)
+        sys.exit(1)
+    if isinstance(run_configs, dict):
+        run_configs = [run_configs]
+    if setup_fn is not None:
+        try:
+            setup_fn(run_configs)
+        except Exception as e:
+            write_error_json(e, None, args.run_configs_json_path, pkg_label)
+            sys.exit(1)
+
+    # Run all cases in this process so imports are only paid once
+    failed = False
+    for run_config in run_configs:
+        try:
+            runner_fn(run_config)
+        except Exception as e:
+            failed = True
+            flush_logs()
+            write_error_json(e, run_config, args.run_configs_json_path, pkg_label)
+        flush_logs()
+    if failed:
+        sys.exit(1)
@@ -1,7 +1,7 @@
 import argparse
-import json
-import os
+import logging
 import sys
+from _common import configure_logging, parse_and_run
 
 # Try to import benchmark modules
 try:
@@ -9,80 +9,62 @@ try:
 except ImportError as e:
     print(f"ERROR: Could not import Dynlab benchmark function: {e}", file=sys.stderr)
     print(
-        "Ensure 'benchmarks.dynlab_benchmark_ftle' module exists and is importable.", 
+        "Ensure 'benchmarks.dynlab_benchmark_ftle' module exists and is importable.",
         file=sys.stderr
     )
     sys.exit(1)
 
-def main():
-    parser = argparse.ArgumentParser(description="Dynlab FTLE Benchmark Runner.")
-    parser.add_argument(
-        "--run-config-json", 
-        required=True, 
-        help="JSON string containing the full run configuration."
-    )
-    args = parser.parse_args()
+logger = logging.getLogger(__name__)
 
-    try:
-        run_config = json.loads(args.run_config_json)
+def run_benchmark(run_config):
+    """Runs the Dynlab benchmark for a single case described by run_config"""
+    output_json_path = run_config['output_json_path']
 
-        output_json_path = run_config['output_json_path']
+    flow_data_dict = run_config['flow_data']
+    iterates_per_run = run_config['iterates_per_run']
+    num_benchmark_runs = run_config['num_benchmark_runs']
+    error_data_dict = run_config.get('error_data', {})
+    metadata_dict = run_config.get('metadata', {})
 
-        flow_data_dict = run_config['flow_data']
-        iterates_per_run = run_config['iterates_per_run']
-        num_benchmark_runs = run_config['num_benchmark_runs']
-        error_data_dict = run_config.get('error_data', {})
-        metadata_dict = run_config.get('metadata', {})
-        
-        # Dynlab has specific param num_threads
-        pkg_specific_params = run_config.get('pkg_specific_params', {}).get('dynlab', {})
-        num_threads = pkg_specific_params.get('num_threads', 8) # Default if not specified
-        
-        # Dynlab only supports predefined in this setup
-        flow_type = run_config['metadata']['case_flow_type']
-        if flow_type != 'predefined':
-            raise ValueError(f"Dynlab runner received unsupported flow_type: {flow_type}")
+    # Dynlab has specific param num_threads
+    pkg_specific_params = run_config.get('pkg_specific_params', {}).get('dynlab', {})
+    num_threads = pkg_specific_params.get('num_threads', 8) # Default if not specified
+    jit_flow = pkg_specific_params.get('jit_flow', False)
+    batched = pkg_specific_params.get('batched', False)
+    single_precision = pkg_specific_params.get('single_precision', False)
 
-        run_dynlab_ftle(
-            flow_data_dict,
-            output_json_path,
-            iterates_per_run,
-            num_benchmark_runs,
-            num_threads=num_threads,
-            error_data=error_data_dict,
-            metadata=metadata_dict
-        )
-        print(
-            f"[Dynlab Runner] Benchmark '{run_config['metadata']['case_id']}' "
-            "completed successfully."
-        )
+    # Dynlab only supports predefined in this setup
+    flow_type = run_config['metadata']['case_flow_type']
+    if flow_type != 'predefined':
+        raise ValueError(f"Dynlab runner received unsupported flow_type: {flow_type}")
 
-    except Exception as e:
-        print(f"[Dynlab Runner] Benchmark FAILED: {type(e).__name__}: {e}", file=sys.stderr)
-        output_path_for_error = "dynlab_error.json"
-        try:
-            parsed_config_for_error_path = json.loads(args.run_config_json)
-            output_path_for_error = (
-                parsed_config_for_error_path.get('output_json_path', output_path_for_error)
-            )
-        except Exception:
-            pass
-        
-        error_output = { 
-            "package": "Dynlab", 
-            "error": f"{type(e).__name__}: {e}", 
-            "run_config_json_str_received": args.run_config_json
-        }
-        try:
-            if output_path_for_error:
-                 output_dir = os.path.dirname(output_path_for_error)
-                 if output_dir and not os.path.exists(output_dir): 
-                     os.makedirs(output_dir)
-                 with open(output_path_for_error, 'w') as f: 
-                     json.dump(error_output, f, indent=2)
-        except Exception: 
-            pass
-        sys.exit(1)
+    run_dynlab_ftle(
+        flow_data_dict,
+        output_json_path,
+        iterates_per_run,
+        num_benchmark_runs,
+        num_threads=num_threads,
+        jit_flow=jit_flow,
+        batched=batched,
+        single_precision=single_precision,
+        error_data=error_data_dict,
+        metadata=metadata_dict
+    )
+    logger.info(
+        f"[Dynlab Runner] Benchmark '{run_config['metadata']['case_id']}' "
+        "completed successfully."
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Dynlab FTLE Benchmark Runner.")
+    parser.add_argument(
+        "--run-configs-json-path",
+        required=True,
+        help="Path to the JSON file containing a list of run configurations (or a single one)."
+    )
+    args = parser.parse_args()
+    configure_logging()
+    parse_and_run(args, run_benchmark, "Dynlab")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,4 @@
 import argparse
-import json
 import os
 import sys
 import subprocess
@@ -8,6 +7,8 @@ def run_matlab_benchmark(
     matlab_script_path, 
     run_config_json_file_path,
     matlab_executable,
+    iterates,
+    num_bench_runs,
     expected_iter_time=200 
 ):
     """
@@ -23,6 +24,10 @@ def run_matlab_benchmark(
     matlab_executable : str
         path to matlab executable, will default to 'matlab'.
         This works if matlab executable is on your path. See README for how to add to path.
+    iterates : int
+        number of iterates per run, used to estimate the timeout.
+    num_bench_runs : int
+        number of benchmark runs, used to estimate the timeout.
     expected_iter_time : int or float, optional
         Expected time for one iterate, will change for different cases. The default is 200.
 
@@ -56,12 +61,6 @@ def run_matlab_benchmark(
     print(f"[Python MATLAB Runner] Executing: {' '.join(cmd)}")
 
     try:
-        # Read iterates_per_run, num_benchmark_runs from the config file to estimate timeout
-        with open(run_config_json_file_path_abs, 'r') as f_cfg:
-            cfg_dict = json.load(f_cfg)
-            iterates = cfg_dict['iterates_per_run']
-            num_bench_runs = cfg_dict['num_benchmark_runs']
-
         timeout_seconds = expected_iter_time*iterates*num_bench_runs + 300 
         process = subprocess.run(
             cmd, capture_output=True, text=True, check=False, timeout=timeout_seconds
@@ -120,6 +119,18 @@ if __name__ == "__main__":
         required=True,
         help="Path to the JSON file containing the run configuration for MATLAB."
     )
+    parser.add_argument(
+        "--iterates", 
+        required=True,
+        type=int,
+        help="Number of iterates per run (iterates_per_run), used to estimate the timeout."
+    )
+    parser.add_argument(
+        "--num-runs", 
+        required=True,
+        type=int,
+        help="Number of benchmark runs (num_benchmark_runs), used to estimate the timeout."
+    )
     parser.add_argument(
         "--matlab-executable", 
         default="matlab", 
@@ -146,7 +157,9 @@ if __name__ == "__main__":
     success = run_matlab_benchmark(
         args.matlab_script, 
         args.run_config_json_path, 
-        args.matlab_executable
+        args.matlab_executable,
+        args.iterates,
+        args.num_runs
     )
 
     # The MATLAB script writes its own output JSON. This runner just signals success/failure.
@@ -47,8 +47,9 @@ function lcstool_data_benchmark(run_config_json)
     u = permute(u, dimorder);
     v = permute(v, dimorder);
     [nt, resolutionY, resolutionX] = size(u);
-    domain = [fdomain(2,1), fdomain(2,2); fdomain(3,1), fdomain(3,2)];
-    time = linspace(domain(1,1), domain(1,2), nt);
+    % fdomain is flat, [tmin, tmax, x0, x1, y0, y1]
+    domain = [fdomain(3), fdomain(4); fdomain(5), fdomain(6)];
+    time = linspace(fdomain(1), fdomain(2), nt);
     [~,deltaX] = equal_resolution(domain,resolutionX);
     resolution = [resolutionX,resolutionY];
     xd = linspace(domain(1,1), domain(1,2), resolutionX);
@@ -1,102 +1,107 @@
 import argparse
-import json
-import os
+import logging
 import sys
+import numpy as np
+from _common import configure_logging, parse_and_run
 
 # Try to import benchmark modules
 try:
     from benchmarks.numbacs_benchmarks_ftle import (
-        run_numbacs_predefined_ftle, run_numbacs_data_ftle
+        run_numbacs_predefined_ftle, run_numbacs_data_ftle, use_fork_safe_threading_layer
     )
 except ImportError as e:
     print(f"ERROR: Could not import NumbaCS benchmark functions: {e}", file=sys.stderr)
     print(
-        "Ensure 'benchmarks.numbacs_implementations' module exists and is importable.", 
+        "Ensure 'benchmarks.numbacs_implementations' module exists and is importable.",
         file=sys.stderr
     )
     sys.exit(1)
 
-def main():
-    parser = argparse.ArgumentParser(description="NumbaCS FTLE Benchmark Runner.")
-    parser.add_argument(
-        "--run-config-json", 
-        required=True, 
-        help="JSON string containing the full run configuration."
-    )
-    args = parser.parse_args()
+logger = logging.getLogger(__name__)
+
+def setup_process(run_configs):
+    """
+    Selects numba's threading layer once for all cases, the workqueue layer if any case
+    runs on forked workers (num_workers) since the layer can not change between cases
+    """
+    if any(
+        run_config.get('pkg_specific_params', {}).get('numbacs', {}).get('num_workers') 
+        is not None for run_config in run_configs
+    ):
+        use_fork_safe_threading_layer()
 
-    try:
-        run_config = json.loads(args.run_config_json)
+def run_benchmark(run_config):
+    """Runs the NumbaCS benchmark for a single case described by run_config"""
+    # Extract common parameters expected by the implementation functions
+    output_json_path = run_config['output_json_path']
+    flow_data_dict = run_config['flow_data']
+    iterates_per_run = run_config['iterates_per_run']
+    num_benchmark_runs = run_config['num_benchmark_runs']
+    error_data_dict = run_config.get('error_data', {})
+    metadata_dict = run_config.get('metadata', {})
 
-        # Extract common parameters expected by the implementation functions
-        output_json_path = run_config['output_json_path']        
-        flow_data_dict = run_config['flow_data']
-        iterates_per_run = run_config['iterates_per_run']
-        num_benchmark_runs = run_config['num_benchmark_runs']
-        error_data_dict = run_config.get('error_data', {})
-        metadata_dict = run_config.get('metadata', {})
+    # Optional NumbaCS specific params
+    pkg_specific_params = run_config.get('pkg_specific_params', {}).get('numbacs', {})
+    num_workers = pkg_specific_params.get('num_workers')
+    reuse_buffers = pkg_specific_params.get('reuse_buffers', False)
 
-        # Pre-processing: Load data from paths
-        flow_type = run_config['metadata']['case_flow_type'] # Get flow_type from metadata
+    # Pre-processing: Load data from paths
+    flow_type = run_config['metadata']['case_flow_type'] # Get flow_type from metadata
 
-        if flow_type == 'data':
-            if 'vel_data_paths' not in flow_data_dict:
-                raise ValueError("NumbaCS 'data' flow type expects 'vel_data_paths' in flow_data.")
+    if flow_type == 'data':
+        if 'vel_data_paths' not in flow_data_dict:
+            raise ValueError("NumbaCS 'data' flow type expects 'vel_data_paths' in flow_data.")
+        # Memory-map the velocity data, pages are only read when the interpolant is built
+        vel_data_paths = flow_data_dict['vel_data_paths']
+        vel_data = (
+            np.load(vel_data_paths['u'], mmap_mode='r'),
+            np.load(vel_data_paths['v'], mmap_mode='r')
+        )
+        # Optional cast of the velocity data (e.g. "float32") before building the interpolant
+        vel_dtype = pkg_specific_params.get('vel_dtype')
 
-        if flow_type == 'predefined':
-            run_numbacs_predefined_ftle(
-                flow_data_dict, 
-                output_json_path, 
-                iterates_per_run, 
-                num_benchmark_runs,
-                error_data=error_data_dict,
-                metadata=metadata_dict 
-            )
-        elif flow_type == 'data':
-            run_numbacs_data_ftle(
-                flow_data_dict,
-                output_json_path,
-                iterates_per_run,
-                num_benchmark_runs,
-                error_data=error_data_dict,
-                metadata=metadata_dict
-            )
-        else:
-            raise ValueError(f"Unsupported flow_type '{flow_type}' for NumbaCS runner.")
+    if flow_type == 'predefined':
+        run_numbacs_predefined_ftle(
+            flow_data_dict,
+            output_json_path,
+            iterates_per_run,
+            num_benchmark_runs,
+            error_data=error_data_dict,
+            metadata=metadata_dict,
+            num_workers=num_workers,
+            reuse_buffers=reuse_buffers
+        )
+    elif flow_type == 'data':
+        run_numbacs_data_ftle(
+            flow_data_dict,
+            output_json_path,
+            iterates_per_run,
+            num_benchmark_runs,
+            error_data=error_data_dict,
+            metadata=metadata_dict,
+            vel_data=vel_data,
+            vel_dtype=vel_dtype,
+            num_workers=num_workers,
+            reuse_buffers=reuse_buffers
+        )
+    else:
+        raise ValueError(f"Unsupported flow_type '{flow_type}' for NumbaCS runner.")
 
-        print(
-            f"[NumbaCS Runner] Benchmark '{run_config['metadata']['case_id']}' "
-            "completed successfully."
-          )
+    logger.info(
+        f"[NumbaCS Runner] Benchmark '{run_config['metadata']['case_id']}' "
+        "completed successfully."
+      )
 
-    except Exception as e:
-        print(f"[NumbaCS Runner] Benchmark FAILED: {type(e).__name__}: {e}", file=sys.stderr)
-        # Try to get output_json_path from the original JSON string if parsing failed early
-        output_path_for_error = "numbacs_error.json"
-        try:
-            # Attempt to parse JSON again just to get output path, if it fails, use default
-            parsed_config_for_error_path = json.loads(args.run_config_json)
-            output_path_for_error = (
-                parsed_config_for_error_path.get('output_json_path', output_path_for_error)
-            )
-        except Exception:
-            pass
-        
-        error_output = { 
-            "package": "NumbaCS", 
-            "error": f"{type(e).__name__}: {e}", 
-            "run_config_json_str_received": args.run_config_json # Log what was received
-        }
-        try:
-            if output_path_for_error:
-                 output_dir = os.path.dirname(output_path_for_error)
-                 if output_dir and not os.path.exists(output_dir): 
-                     os.makedirs(output_dir)
-                 with open(output_path_for_error, 'w') as f: 
-                     json.dump(error_output, f, indent=2)
-        except Exception: 
-            pass
-        sys.exit(1)
+def main():
+    parser = argparse.ArgumentParser(description="NumbaCS FTLE Benchmark Runner.")
+    parser.add_argument(
+        "--run-configs-json-path",
+        required=True,
+        help="Path to the JSON file containing a list of run configurations (or a single one)."
+    )
+    args = parser.parse_args()
+    configure_logging()
+    parse_and_run(args, run_benchmark, "NumbaCS", setup_fn=setup_process)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,148 @@
+import numpy as np
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# Dormand-Prince 5(4) tableau
+_C = np.array([0.0, 1/5, 3/10, 4/5, 8/9, 1.0])
+_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+)
+_B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84])
+# Difference between 5th and embedded 4th order weights (last entry is the FSAL stage)
+_E = np.array([-71/57600, 0.0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+def integrate_batch(state, t0, tf, dt, rhs, rtol=1e-6, atol=1e-8, max_steps=100000):
+    """
+    Integrates a batch of particles from t0 to tf with an adaptive Dormand-Prince 5(4)
+    method where all particles share the same step. The step is controlled by the
+    largest scaled error over all particles and rhs is evaluated once per stage on the
+    whole batch.
+
+    Parameters
+    ----------
+    state : np.ndarray, shape = (ndims, npts)
+        initial positions of the particles.
+    t0 : float
+        initial time.
+    tf : float
+        final time, can be less than t0 for backward time integration.
+    dt : float
+        initial step size (magnitude).
+    rhs : callable
+        vector field rhs(t, state) returning an array-like of shape (ndims, npts).
+    rtol : float, optional
+        relative tolerance. The default is 1e-6.
+    atol : float, optional
+        absolute tolerance. The default is 1e-8.
+    max_steps : int, optional
+        maximum number of attempted steps. The default is 100000.
+
+    Notes
+    -----
+    The state is carried in the floating dtype of state (float32 states stay float32,
+    anything else is float64). For float32, tolerances must be loose enough for single
+    precision (e.g. rtol=1e-4, atol=1e-6), otherwise the step may never be accepted.
+
+    Returns
+    -------
+    y : np.ndarray, shape = (ndims, npts)
+        positions of the particles at time tf.
+
+    """
+    y = np.array(state, dtype=np.result_type(state, np.float32), copy=True)
+    direction = 1.0 if tf >= t0 else -1.0
+    h = min(abs(dt), abs(tf - t0))
+    t = t0
+    if h == 0.0:
+        return y
+
+    K = np.empty((7,) + y.shape, y.dtype)
+    B = _B.astype(y.dtype)
+    K[0] = rhs(t, y)
+    n_steps = 0
+    while direction*(tf - t) > 0:
+        if n_steps >= max_steps:
+            raise RuntimeError(f"integrate_batch exceeded max_steps={max_steps}.")
+        n_steps += 1
+        h = min(h, abs(tf - t))
+        hs = direction*h
+        for s in range(1, 6):
+            dy = _A[s][0]*K[0]
+            for m in range(1, s):
+                dy += _A[s][m]*K[m]
+            K[s] = rhs(t + _C[s]*hs, y + hs*dy)
+        y_new = y + hs*np.tensordot(B, K[:6], axes=1)
+        K[6] = rhs(t + hs, y_new)
+
+        # RMS error over dimensions for each particle, step driven by the worst particle
+        scale = atol + rtol*np.maximum(np.abs(y), np.abs(y_new))
+        err = np.sqrt(np.mean((hs*np.tensordot(_E, K, axes=1)/scale)**2, axis=0)).max()
+        if err <= 1.0:
+            t = t + hs
+            y = y_new
+            K[0] = K[6]
+            factor = 10.0 if err == 0.0 else min(10.0, 0.9*err**-0.2)
+        else:
+            factor = max(0.2, 0.9*err**-0.2)
+        h = h*factor
+
+    return y
+
+def double_gyre_vec(t, xy, A=0.1, eps=0.25, omega=0.2*np.pi):
+    """
+    Double gyre velocity for a whole batch of particles, using the same parameters and
+    form as dynlab.flows.double_gyre. The time dependent coefficients are computed once
+    per call and, if numexpr is installed, each velocity component is evaluated in a
+    single fused pass without full size temporaries.
+
+    Parameters
+    ----------
+    t : float
+        time.
+    xy : np.ndarray, shape = (2, npts)
+        particle positions (float32 or float64).
+    A : float, optional
+        amplitude of the gyre velocity. The default is 0.1.
+    eps : float, optional
+        strength of the driving force. The default is 0.25.
+    omega : float, optional
+        frequency of the driving force. The default is 0.2*pi.
+
+    Returns
+    -------
+    uv : np.ndarray, shape = (2, npts)
+        velocity of each particle, same dtype as xy.
+
+    """
+    # Scalars are cast to the state dtype so float32 batches stay float32
+    ct = xy.dtype.type
+    a = eps*np.sin(omega*t)
+    b = ct(1 - 2*a)
+    a = ct(a)
+    A = ct(A)
+    x = xy[0]
+    y = xy[1]
+    uv = np.empty_like(xy)
+    if ne is not None:
+        local_dict = {'a': a, 'b': b, 'x': x, 'y': y, 'A': A, 'pi': ct(np.pi)}
+        ne.evaluate(
+            "-pi*A*sin(pi*(a*x*x + b*x))*cos(pi*y)", local_dict=local_dict, out=uv[0]
+        )
+        ne.evaluate(
+            "pi*A*cos(pi*(a*x*x + b*x))*sin(pi*y)*(2*a*x + b)", local_dict=local_dict, out=uv[1]
+        )
+    else:
+        pi = ct(np.pi)
+        pi_f = pi*(a*x*x + b*x)
+        pi_y = pi*y
+        uv[0] = -pi*A*np.sin(pi_f)*np.cos(pi_y)
+        uv[1] = pi*A*np.cos(pi_f)*np.sin(pi_y)*(2*a*x + b)
+
+    return uv
@@ -2,11 +2,74 @@
 
 import numpy as np
 from dynlab.diagnostics import FTLE
+# Private base class, BatchedFTLE depends on dynlab internals (the version is pinned in
+# the noxfile PACKAGES_CONFIG)
+from dynlab.diagnostics._base_classes import LagrangianDiagnostic2D
 from dynlab.flows import double_gyre, bickley_jet
 import time
 import json
 import os
+import logging
 from benchmarks.utils import MAE
+from benchmarks.batch_integration import integrate_batch, double_gyre_vec
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+class _BatchedFlowMap(LagrangianDiagnostic2D):
+    """
+    Replaces dynlab's per-trajectory flow map with a single batched integration of all
+    grid points, dynlab flows are written with NumPy ops so they accept the whole batch.
+    The batch is integrated in self.dtype and the flow map is returned as float64 so the
+    Cauchy-Green tensor, its eigenvalues and the log are always computed in FP64.
+    """
+    dtype = np.float64
+
+    def compute(self, x, y, f, t, rtol=1e-6, atol=1e-8, dt=None, **kwargs):
+        # LagrangianDiagnostic2D.compute is the per-trajectory integration this replaces,
+        # skip it and call Diagnostic2D.compute which only validates and sets x, y and
+        # their dims (self.xdim, self.ydim)
+        super(LagrangianDiagnostic2D, self).compute(x, y)
+        if len(t) != 2:
+            raise ValueError("t must only have 2 values, t_0 and t_final")
+        if dt is None:
+            dt = abs(t[-1] - t[0])/100
+        X, Y = np.meshgrid(self.x, self.y)
+        state = np.stack((X.ravel(), Y.ravel())).astype(self.dtype)
+        state_final = integrate_batch(state, t[0], t[-1], dt, f, rtol=rtol, atol=atol)
+
+        return state_final.T.reshape([self.ydim, self.xdim, 2]).astype(np.float64)
+
+class BatchedFTLE(FTLE, _BatchedFlowMap):
+    """dynlab FTLE whose flow map is computed with benchmarks.batch_integration"""
+    # dynlab has no public hook for a batched flow map, FTLE.compute gets it from
+    # super().compute. With this base order the MRO is BatchedFTLE -> FTLE ->
+    # _BatchedFlowMap -> LagrangianDiagnostic2D, so that call resolves to
+    # _BatchedFlowMap.compute while the gradients/eigenvalues are still dynlab's FTLE code
+    def __init__(self, dtype=np.float64):
+        super().__init__(num_threads=1)
+        self.dtype = dtype
+
+def _jit_flow(f):
+    """
+    Compiles a dynlab flow function f(t, Y) with numba. Calling the compiled flow from
+    Python with its default parameters omitted is slow, so it is wrapped in a compiled
+    function with only the (t, Y) arguments odeint passes.
+    """
+    f_jit = njit(cache=True, fastmath=True)(f)
+
+    @njit(fastmath=True)
+    def flow(t, Y):
+        return f_jit(t, Y)
+    
+    return flow
 
 def run_dynlab_ftle(
         flow_data,
@@ -14,6 +77,9 @@ def run_dynlab_ftle(
         iterates_per_run, 
         num_benchmark_runs, 
         num_threads=8, 
+        jit_flow=False,
+        batched=False,
+        single_precision=False,
         error_data={},
         metadata={}
 ):
@@ -25,7 +91,7 @@ def run_dynlab_ftle(
     flow_data : dict
         dict containing flow data with the following key-value pairs:
             flow_str: str, 
-            domain: ((float, float), (float, float)), 
+            domain: [float, float, float, float] -- [x0, x1, y0, y1], 
             grid_shape: (int, int), 
             t0: float, 
             T: float,
@@ -38,6 +104,20 @@ def run_dynlab_ftle(
         number of benchmark runs to perform, should be at least 1.
     num_threads : int
         number of threads dynlab will use, default to 8 for comparison with NumbaCS
+    jit_flow : bool
+        if True, the dynlab flow function is compiled with numba before being passed to
+        dynlab (requires numba). This no longer benchmarks dynlab as shipped so it is
+        opt-in. The default is False.
+    batched : bool
+        if True, the flow map is computed by integrating all grid points together with a
+        shared adaptive step (BatchedFTLE) instead of dynlab's per-trajectory odeint calls,
+        num_threads is then ignored. Unless jit_flow is set, the double gyre is evaluated
+        with benchmarks.batch_integration.double_gyre_vec. Opt-in for the same reason as
+        jit_flow. The default is False.
+    single_precision : bool
+        if True (requires batched), trajectories are integrated in float32 with tolerances
+        rtol=1e-4, atol=1e-6 instead of float64 with rtol=1e-6, atol=1e-8. The FTLE itself
+        is still computed in float64. The default is False.
     error_data : dict
         dict containing path to data for error computation and parameters. The default is {}.
     metadata : dict
@@ -62,85 +142,115 @@ def run_dynlab_ftle(
             "and 'bickley_jet'. Dynlab supports many more flows but we "
             "do not benchmark them all here."
         )
-    domain = flow_data['domain']
+    if jit_flow:
+        if njit is None:
+            raise ImportError("jit_flow=True requires numba to be installed.")
+        # Compiled flow is still called from odeint but avoids Python level numpy scalar ops
+        f = _jit_flow(f)
+    elif batched and flow_str.lower() == 'double_gyre':
+        # Same flow as dynlab's double_gyre but fused for whole batches
+        f = double_gyre_vec
+    if single_precision and not batched:
+        raise ValueError("single_precision=True is only supported with batched=True.")
+    # Float32 can not reach the double precision tolerances
+    rtol, atol = (1e-4, 1e-6) if single_precision else (1e-6, 1e-8)
+    x0, x1, y0, y1 = flow_data['domain']
     nx, ny = flow_data['grid_shape']
     t0 = flow_data['t0']
     T = flow_data['T']
     dt0 = flow_data['dt0']
     package = metadata['package_name']
     case = metadata['case_description']
-    print(f'--- {package} benchmark: {case} ---')
-    print(f'Output JSON: {output_json_path}')
-    print(f'Iterations per run: {iterates_per_run}')
-    print(f'Number of benchmark runs: {num_benchmark_runs}')
+    logger.info(f'--- {package} benchmark: {case} ---')
+    logger.info(f'Output JSON: {output_json_path}')
+    logger.info(f'Iterations per run: {iterates_per_run}')
+    logger.info(f'Number of benchmark runs: {num_benchmark_runs}')
 
-    # Set up parameters
-    x = np.linspace(domain[0][0], domain[0][1], nx)
-    y = np.linspace(domain[1][0], domain[1][1], ny)
+    # Set up parameters. FTLE.compute only accepts 1D coordinate arrays (it raises on
+    # meshgrids and never builds one internally), passing np.ndarray skips its cast
+    x = np.linspace(x0, x1, nx)
+    y = np.linspace(y0, y1, ny)
     
     results = {}
+    # Opt-in options are recorded so results that do not benchmark dynlab as shipped
+    # are labelled as such by readme_updater
     results['parameters'] = {
         "iterates_per_run": iterates_per_run, 
-        "num_benchmark_runs": num_benchmark_runs
+        "num_benchmark_runs": num_benchmark_runs,
+        "jit_flow": jit_flow,
+        "batched": batched,
+        "single_precision": single_precision
     }
     timing_data = {}
     
-    # First call and record warmup time
-    print("Starting warm-up...")
-    # Compute error from this warmup run if error_data supplied
+    # Create the FTLE object once and reuse it for all calls so object construction is
+    # not included in the timings. With num_threads > 1 dynlab still opens a new process
+    # pool inside every compute call, so pool startup remains part of each iterate
+    if batched:
+        ftle_obj = BatchedFTLE(dtype=np.float32 if single_precision else np.float64)
+    else:
+        ftle_obj = FTLE(num_threads=num_threads)
+    
+    # Precompute integration intervals so they are not built inside the timed loops
+    time_spans = [(t0 + k*dt0, T + k*dt0) for k in range(iterates_per_run)]
+    
+    # First call and record warmup time. If error_data is supplied, the warm-up is
+    # computed over the error interval and its output is reused for the error so
+    # no additional FTLE evaluation is needed
+    logger.info("Starting warm-up...")
     if error_data:
-        ftle_true = error_data['true_data']
         t0_true = error_data['t0']
-        wu_start = time.perf_counter()
-        ftle_est = FTLE(num_threads=num_threads).compute(
-            x, y, f, (t0_true, T + t0_true), edge_order=1, rtol=1e-6, atol=1e-8
-        )
-        warmup_time = time.perf_counter() - wu_start
-        mae = MAE(ftle_true, ftle_est, edge=False)
-        results['error'] = {'mae': mae, 'error_params': error_data['error_params']}
+        warmup_span = (t0_true, T + t0_true)
     else:
-        wu_start = time.perf_counter()
-        _ = FTLE(num_threads=num_threads).compute(
-            x, y, f, (t0, T), edge_order=1, rtol=1e-6, atol=1e-8
-        )
-        warmup_time = time.perf_counter() - wu_start
-    print(f"Warm-up completed, took {warmup_time:.5f} seconds.")
+        warmup_span = time_spans[0]
+    wu_start = time.perf_counter_ns()
+    ftle_est = ftle_obj.compute(
+        x, y, f, warmup_span, edge_order=1, rtol=rtol, atol=atol
+    )
+    warmup_time = (time.perf_counter_ns() - wu_start)*1e-9
+    if error_data:
+        mae = MAE(error_data['true_data'], ftle_est, edge=False)
+        results['error'] = {'mae': mae, 'error_params': error_data['error_params']}
+    logger.info(f"Warm-up completed, took {warmup_time:.5f} seconds.")
     
     # Benchmarks
     if num_benchmark_runs > 1:
-        loop_times = np.zeros(num_benchmark_runs, np.float64)
+        loop_times = np.empty(num_benchmark_runs, np.float64)
         for i in range(num_benchmark_runs):
-            print(f"Starting benchmark run {i+1} of {num_benchmark_runs}...")
-            l_start = time.perf_counter()
-            for k in range(iterates_per_run):
-                _ = FTLE(num_threads=num_threads).compute(
-                    x, y, f, (t0 + k*dt0, T + k*dt0), edge_order=1, rtol=1e-6, atol=1e-8
+            logger.info(f"Starting benchmark run {i+1} of {num_benchmark_runs}...")
+            l_start = time.perf_counter_ns()
+            for span in time_spans:
+                _ = ftle_obj.compute(
+                    x, y, f, span, edge_order=1, rtol=rtol, atol=atol
                 ) 
-            loop_time = time.perf_counter() - l_start
-            print(
+            loop_time = (time.perf_counter_ns() - l_start)*1e-9
+            logger.info(
                 f"Benchmark run {i+1} of {num_benchmark_runs} completed, "
                 f"took {loop_time:.5f} seconds."
             )
             loop_times[i] = loop_time
         per_iter_times = loop_times/iterates_per_run
+        # Per iterate stats are the loop stats scaled by iterates_per_run
+        mean_loop_time = loop_times.sum()/num_benchmark_runs
+        std_loop_time = np.sqrt(((loop_times - mean_loop_time)**2).sum()/num_benchmark_runs)
         timing_data['warmup_time'] = warmup_time
-        timing_data['loop_times'] = loop_times.tolist()
-        timing_data['per_iter_times'] = per_iter_times.tolist()
-        timing_data['mean_loop_time'] = np.mean(loop_times)
-        timing_data['mean_per_iter_time'] = np.mean(per_iter_times)
-        timing_data['std_loop_time'] = np.std(loop_times)
-        timing_data['std_per_iter_time'] = np.std(per_iter_times)
+        timing_data['loop_times'] = loop_times
+        timing_data['per_iter_times'] = per_iter_times
+        timing_data['mean_loop_time'] = float(mean_loop_time)
+        timing_data['mean_per_iter_time'] = float(mean_loop_time/iterates_per_run)
+        timing_data['std_loop_time'] = float(std_loop_time)
+        timing_data['std_per_iter_time'] = float(std_loop_time/iterates_per_run)
     elif num_benchmark_runs < 1:
         raise ValueError("num_benchmark_runs must be at least 1")
     else:
-        print("Starting benchmark run 1 of 1...")
-        l_start = time.perf_counter()
-        for k in range(iterates_per_run):
-            _ = FTLE(num_threads=num_threads).compute(
-                x, y, f, (t0 + k*dt0, T + k*dt0), edge_order=1, rtol=1e-6, atol=1e-8
+        logger.info("Starting benchmark run 1 of 1...")
+        l_start = time.perf_counter_ns()
+        for span in time_spans:
+            _ = ftle_obj.compute(
+                x, y, f, span, edge_order=1, rtol=rtol, atol=atol
             ) 
-        loop_time = time.perf_counter() - l_start
-        print(
+        loop_time = (time.perf_counter_ns() - l_start)*1e-9
+        logger.info(
             f"Benchmark run 1 of 1 completed, "
             f"took {loop_time:.5f} seconds."
         )
@@ -155,13 +265,19 @@ def run_dynlab_ftle(
     results['metadata'] = metadata
     
     # Write to JSON
-    print(f"Saving results to: {output_json_path}")
+    logger.info(f"Saving results to: {output_json_path}")
     try:
         os.makedirs(os.path.dirname(output_json_path), exist_ok=True)
-        with open(output_json_path, 'w') as f:
-            json.dump(results, f, indent=2)
-            print("Results saved.")
+        if orjson is not None:
+            with open(output_json_path, 'wb') as f:
+                f.write(
+                    orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+                )
+        else:
+            with open(output_json_path, 'w') as f:
+                json.dump(results, f, indent=2, default=lambda a: a.tolist())
+        logger.info("Results saved.")
     except IOError as e:
-        print(f"Error saving JSON: {e}")
+        logger.error(f"Error saving JSON: {e}")
         raise
-    print(f"--- {package} benchmark complete ---")
+    logger.info(f"--- {package} benchmark complete ---")
@@ -1,4 +1,4 @@
-from math import copysign
+from math import copysign, log
 import numpy as np
 from numbacs.flows import get_predefined_flow, get_interp_arrays_2D, get_flow_2D
 from numbacs.integration import flowmap_grid_2D
@@ -6,15 +6,232 @@ from numbacs.diagnostics import ftle_grid_2D
 import time
 import json
 import os
+import logging
+import multiprocessing
+from functools import lru_cache
+import numba
+from numba import njit, prange, get_num_threads, set_num_threads, threading_layer
 from benchmarks.utils import MAE
 
+logger = logging.getLogger(__name__)
+
+@njit
+def _batch_flowmap_ftle(funcptr, t0, dt0, T, x, y, params, dx, dy, n):
+    """
+    Computes n flow map + FTLE iterates, the k-th starting at t0 + k*dt0, in a single
+    compiled call so the iterate loop has no Python dispatch overhead.
+
+    Parameters
+    ----------
+    funcptr : int
+        pointer to C callback of the flow.
+    t0 : float
+        initial time of the first iterate.
+    dt0 : float
+        offset between initial times of consecutive iterates.
+    T : float
+        integration time.
+    x : np.ndarray, shape = (nx,)
+        array containing x-values.
+    y : np.ndarray, shape = (ny,)
+        array containing y-values.
+    params : np.ndarray, shape = (nprms,)
+        array of parameters passed to the flow.
+    dx : float
+        grid spacing in x-direction.
+    dy : float
+        grid spacing in y-direction.
+    n : int
+        number of iterates, 0 only compiles the driver.
+
+    Returns
+    -------
+    ftle : np.ndarray, shape = (nx, ny)
+        ftle field of the last iterate.
+
+    """
+    ftle = np.zeros((len(x), len(y)))
+    for k in range(n):
+        flowmap = flowmap_grid_2D(funcptr, t0 + k*dt0, T, x, y, params)
+        ftle = ftle_grid_2D(flowmap, T, dx, dy)
+
+    return ftle
+
+@lru_cache(maxsize=None)
+def _get_batch_driver(nx, ny):
+    """
+    Returns a batch driver with the signature of _batch_flowmap_ftle that reuses its flow
+    map and FTLE buffers (reuse_buffers=True), compiled for an (nx, ny) grid. numbacs'
+    flowmap_grid_2D and ftle_grid_2D allocate their output on every call, the kernels
+    below are the same computations (no mask, the installed flowmap_grid_2D default
+    solver settings) writing into preallocated arrays. nx and ny are closure constants
+    of the compiled functions, so the FTLE loop bounds and buffer shapes are known at
+    compile time and LLVM can unroll and vectorize the finite-difference loop for this
+    grid size. One driver per grid size is compiled (lazily, on its first call) and
+    cached.
+    """
+    # numbacs internals (and the flowmap_grid_2D signature) are only looked up here so a
+    # numbacs release changing them can only break reuse_buffers=True
+    import inspect
+    from numbacs.utils import gradF_stencil_2D, eigvalsh_max_2D_direct
+    from numbalsoda import dop853, lsoda
+    flowmap_defaults = {
+        name: prm.default 
+        for name, prm in inspect.signature(flowmap_grid_2D.py_func).parameters.items()
+        if prm.default is not inspect.Parameter.empty
+    }
+    method = flowmap_defaults['method'].lower()
+    if method not in ("dop853", "lsoda"):
+        raise ValueError(
+            f"reuse_buffers does not support the numbacs default method '{method}'"
+        )
+    use_dop853 = method == "dop853"
+    rtol = flowmap_defaults['rtol']
+    atol = flowmap_defaults['atol']
+
+    @njit(parallel=True)
+    def _flowmap_grid_2D_into(funcptr, t0, T, x, y, params, out):
+        """numbacs.integration.flowmap_grid_2D (no mask) writing into out"""
+        t_eval = params[0]*np.linspace(t0, t0 + T, 2)
+        for i in prange(nx):
+            for j in range(ny):
+                if use_dop853:
+                    flowmap_tmp, success = dop853(
+                        funcptr, np.array([x[i], y[j]]), t_eval, rtol=rtol, atol=atol, 
+                        data=params
+                    )
+                else:
+                    flowmap_tmp, success = lsoda(
+                        funcptr, np.array([x[i], y[j]]), t_eval, rtol=rtol, atol=atol, 
+                        data=params
+                    )
+                out[i, j, :] = flowmap_tmp[-1, :]
+
+    @njit(parallel=True)
+    def _ftle_grid_2D_into(flowmap, T, dx, dy, out):
+        """
+        numbacs.diagnostics.ftle_grid_2D (no mask) writing into out, only interior points
+        are written so edges keep the value of out (0 for the driver's buffer)
+        """
+        scaling = 1/(2*abs(T))
+        for i in prange(1, nx - 1):
+            for j in range(1, ny - 1):
+                dxdx, dxdy, dydx, dydy = gradF_stencil_2D(flowmap, i, j, dx, dy)
+
+                C11 = dxdx**2 + dydx**2
+                C12 = dxdx*dxdy + dydx*dydy
+                C22 = dxdy**2 + dydy**2
+
+                max_eig = eigvalsh_max_2D_direct(C11, C12, C22)
+                if max_eig > 1:
+                    out[i, j] = scaling*log(max_eig)
+                else:
+                    out[i, j] = 0.0
+
+    @njit
+    def _batch_flowmap_ftle_into(funcptr, t0, dt0, T, x, y, params, dx, dy, n):
+        """_batch_flowmap_ftle with the flow map and FTLE buffers allocated once"""
+        flowmap = np.empty((nx, ny, 2))
+        ftle = np.zeros((nx, ny))
+        for k in range(n):
+            _flowmap_grid_2D_into(funcptr, t0 + k*dt0, T, x, y, params, flowmap)
+            _ftle_grid_2D_into(flowmap, T, dx, dy, ftle)
+
+        return ftle
+
+    return _batch_flowmap_ftle_into
+
+# Batch driver and its arguments for the forked worker processes of _parallel_loop_times.
+# Workers are forked so they inherit the compiled functions and the flow's function
+# pointer (which is only valid in this process' address space).
+_RUN_STATE = {}
+
+def _one_run(run_index):
+    """Performs one benchmark run in a worker and returns its loop time in seconds"""
+    start = time.perf_counter_ns()
+    _ = _RUN_STATE['driver'](*_RUN_STATE['args'])
+    
+    return (time.perf_counter_ns() - start)*1e-9
+
+def use_fork_safe_threading_layer():
+    """
+    Selects numba's workqueue threading layer, needed by benchmarks with num_workers. A
+    process that has used the tbb layer hangs at exit after forking and GNU OpenMP aborts
+    in forked children. The layer applies to the whole process and is fixed once a
+    parallel function has run, so call this once before the first case.
+    """
+    try:
+        layer = threading_layer()
+    except ValueError:
+        # No parallel function has run in this process yet
+        numba.config.THREADING_LAYER = 'workqueue'
+        return
+    if layer != 'workqueue':
+        raise ValueError(
+            f"Cannot select numba's workqueue threading layer, '{layer}' is already in use"
+        )
+
+def _check_fork_safe_threading_layer():
+    """Raises a ValueError unless numba uses (or will use) the workqueue threading layer"""
+    try:
+        layer = threading_layer()
+    except ValueError:
+        layer = numba.config.THREADING_LAYER
+    if layer != 'workqueue':
+        raise ValueError(
+            "num_workers requires numba's workqueue threading layer, call "
+            + "use_fork_safe_threading_layer() before the first case or set "
+            + "NUMBA_THREADING_LAYER=workqueue"
+        )
+
+def _check_num_workers(num_workers):
+    """Raises a ValueError unless num_workers is a positive integer"""
+    if isinstance(num_workers, bool) or not isinstance(num_workers, int) or num_workers < 1:
+        raise ValueError(f"num_workers must be a positive integer or None, got {num_workers!r}")
+
+def _parallel_loop_times(batch_driver, batch_args, num_benchmark_runs, num_workers):
+    """
+    Performs num_benchmark_runs independent runs of batch_driver(*batch_args) on
+    a pool of forked single threaded worker processes. Requires the workqueue threading
+    layer (see use_fork_safe_threading_layer).
+
+    Returns
+    -------
+    loop_times : np.ndarray, shape = (num_benchmark_runs,)
+        loop time of each run in seconds.
+    num_workers : int
+        number of worker processes used (at most num_benchmark_runs and the cpu count).
+
+    """
+    num_workers = min(num_benchmark_runs, num_workers, os.cpu_count() or 1)
+    logger.info(f"Starting {num_benchmark_runs} benchmark runs on {num_workers} workers...")
+    _RUN_STATE['driver'] = batch_driver
+    _RUN_STATE['args'] = batch_args
+    # Workers inherit the number of numba threads from this process at fork, limit it to one
+    # here (changing it inside forked workers is not safe with every threading layer) so
+    # concurrent runs do not oversubscribe the cores
+    num_threads = get_num_threads()
+    set_num_threads(1)
+    try:
+        ctx = multiprocessing.get_context('fork')
+        with ctx.Pool(processes=num_workers) as pool:
+            loop_times = np.array(pool.map(_one_run, range(num_benchmark_runs)))
+    finally:
+        set_num_threads(num_threads)
+        _RUN_STATE.clear()
+    logger.info(f"Benchmark runs completed, took {loop_times.sum():.5f} seconds in total.")
+    
+    return loop_times, num_workers
+
 def run_numbacs_predefined_ftle(
         flow_data, 
         output_json_path, 
         iterates_per_run, 
         num_benchmark_runs, 
         error_data={},
-        metadata={}
+        metadata={},
+        num_workers=None,
+        reuse_buffers=False
 ):
     """
     Runs numbacs benchmark for double gyre flow
@@ -34,6 +251,18 @@ def run_numbacs_predefined_ftle(
         dict containing path to data for error computation and parameters. The default is {}.
     metadata : dict
         dict containing metadata for specific package/case. The default is {}.
+    num_workers : int or None
+        if given, the benchmark runs are performed concurrently on up to num_workers
+        single threaded worker processes instead of one after the other with all numba
+        threads. Timings are then single thread timings. Requires numba's workqueue
+        threading layer (see use_fork_safe_threading_layer). The number of worker
+        processes actually used (None for runs in this process) is saved as
+        timings['num_workers']. The default is None.
+    reuse_buffers : bool
+        if True, the timed iterates use local versions of the numbacs flow map and FTLE
+        kernels (same solver settings) that reuse preallocated buffers and are compiled
+        for this grid size, otherwise numbacs' flowmap_grid_2D and ftle_grid_2D are
+        timed as shipped. The default is False.
 
     Returns
     -------
@@ -50,10 +279,13 @@ def run_numbacs_predefined_ftle(
     dt0 = flow_data['dt0']
     package = metadata['package_name']
     case = metadata['case_description']
-    print(f'--- {package} benchmark: {case} ---')
-    print(f'Output JSON: {output_json_path}')
-    print(f'Iterations per run: {iterates_per_run}')
-    print(f'Number of benchmark runs: {num_benchmark_runs}')
+    logger.info(f'--- {package} benchmark: {case} ---')
+    logger.info(f'Output JSON: {output_json_path}')
+    logger.info(f'Iterations per run: {iterates_per_run}')
+    logger.info(f'Number of benchmark runs: {num_benchmark_runs}')
+    if num_workers is not None:
+        _check_num_workers(num_workers)
+        _check_fork_safe_threading_layer()
 
     # Set up flow parameters
     funcptr, params, domain = get_predefined_flow(flow_str, int_direction = 1.0)
@@ -69,41 +301,66 @@ def run_numbacs_predefined_ftle(
     }
     timing_data = {}
     
+    # Compile for these argument types (numbacs functions on an 8x8 corner of the grid,
+    # the batch driver with 0 iterates) so compilation is not part of the warm-up (or the
+    # error run), record it separately
+    logger.info("Compiling...")
+    c_start = time.perf_counter_ns()
+    flowmap = flowmap_grid_2D(funcptr, t0, T, x[:8], y[:8], params)
+    _ = ftle_grid_2D(flowmap, T, dx, dy)
+    batch_driver = _get_batch_driver(len(x), len(y)) if reuse_buffers else _batch_flowmap_ftle
+    _ = batch_driver(funcptr, t0, dt0, T, x, y, params, dx, dy, 0)
+    compile_time = (time.perf_counter_ns() - c_start)*1e-9
+    logger.info(f"Compilation completed, took {compile_time:.5f} seconds.")
+    
     # First call and record warmup time
-    print("Starting warm-up...")
+    logger.info("Starting warm-up...")
     # Compute error from this warmup run if error_data supplied
     if error_data:
-        ftle_true = error_data['true_data']
+        # The MAE is only a diagnostic, compute it in float32 on C-contiguous arrays to
+        # halve the bytes read by the reduction
+        ftle_true = np.ascontiguousarray(error_data['true_data'], dtype=np.float32)
         t0_true = error_data['t0']
-        wu_start = time.perf_counter()
+        wu_start = time.perf_counter_ns()
         flowmap = flowmap_grid_2D(funcptr, t0_true, T, x, y, params)
         ftle_est = ftle_grid_2D(flowmap, T, dx, dy)
-        warmup_time = time.perf_counter() - wu_start
-        mae = MAE(ftle_true, ftle_est, edge=False)
+        warmup_time = (time.perf_counter_ns() - wu_start)*1e-9
+        mae = MAE(ftle_true, ftle_est.astype(np.float32, copy=False), edge=False)
         results['error'] = {'mae': mae, 'error_params': error_data['error_params']}
     else:
-        wu_start = time.perf_counter()
+        wu_start = time.perf_counter_ns()
         flowmap = flowmap_grid_2D(funcptr, t0, T, x, y, params)
         _ = ftle_grid_2D(flowmap, T, dx, dy)
-        warmup_time = time.perf_counter() - wu_start
-    print(f"Warm-up completed, took {warmup_time:.5f} seconds.")
+        warmup_time = (time.perf_counter_ns() - wu_start)*1e-9
+    logger.info(f"Warm-up completed, took {warmup_time:.5f} seconds.")
     
     # Run benchmarks
     if num_benchmark_runs > 1:
-        loop_times = np.zeros(num_benchmark_runs, np.float64)
-        for i in range(num_benchmark_runs):
-            print(f"Starting benchmark run {i+1} of {num_benchmark_runs}...")
-            l_start = time.perf_counter()
-            for k in range(iterates_per_run):
-                flowmap = flowmap_grid_2D(funcptr, t0 + k*dt0, T, x, y, params)
-                _ = ftle_grid_2D(flowmap, T, dx, dy)
-            loop_time = time.perf_counter() - l_start
-            print(
-                f"Benchmark run {i+1} of {num_benchmark_runs} completed, "
-                f"took {loop_time:.5f} seconds."
+        # Integer tick counts, converted to seconds once after all runs. Start and end
+        # ticks are separate so the log calls between runs are not timed
+        batch_args = (funcptr, t0, dt0, T, x, y, params, dx, dy, iterates_per_run)
+        if num_workers is not None:
+            loop_times, workers_used = _parallel_loop_times(
+                batch_driver, batch_args, num_benchmark_runs, num_workers
             )
-            loop_times[i] = loop_time
+        else:
+            workers_used = None
+            start_ticks = np.empty(num_benchmark_runs, np.int64)
+            end_ticks = np.empty(num_benchmark_runs, np.int64)
+            for i in range(num_benchmark_runs):
+                logger.info(f"Starting benchmark run {i+1} of {num_benchmark_runs}...")
+                start_ticks[i] = time.perf_counter_ns()
+                _ = batch_driver(*batch_args)
+                end_ticks[i] = time.perf_counter_ns()
+                logger.info(
+                    f"Benchmark run {i+1} of {num_benchmark_runs} completed, "
+                    f"took {(end_ticks[i] - start_ticks[i])*1e-9:.5f} seconds."
+                )
+            loop_times = (end_ticks - start_ticks)*1e-9
         per_iter_times = loop_times/iterates_per_run
+        timing_data['num_workers'] = workers_used
+        timing_data['reuse_buffers'] = reuse_buffers
+        timing_data['compile_time'] = compile_time
         timing_data['warmup_time'] = warmup_time
         timing_data['loop_times'] = loop_times.tolist()
         timing_data['per_iter_times'] = per_iter_times.tolist()
@@ -114,17 +371,19 @@ def run_numbacs_predefined_ftle(
     elif num_benchmark_runs < 1:
         raise ValueError("num_benchmark_runs must be at least 1")
     else:
-        print("Starting benchmark run 1 of 1...")
-        l_start = time.perf_counter()
-        for k in range(iterates_per_run):
-            flowmap = flowmap_grid_2D(funcptr, t0 + k*dt0, T, x, y, params)
-            _ = ftle_grid_2D(flowmap, T, dx, dy)
-        loop_time = time.perf_counter() - l_start
-        print(
+        logger.info("Starting benchmark run 1 of 1...")
+        l_start = time.perf_counter_ns()
+        _ = batch_driver(funcptr, t0, dt0, T, x, y, params, dx, dy, iterates_per_run)
+        loop_time = (time.perf_counter_ns() - l_start)*1e-9
+        logger.info(
             f"Benchmark run 1 of 1 completed, "
             f"took {loop_time:.5f} seconds."
         )
         per_iter_time = loop_time/iterates_per_run
+        # A single run is always performed in this process
+        timing_data['num_workers'] = None
+        timing_data['reuse_buffers'] = reuse_buffers
+        timing_data['compile_time'] = compile_time
         timing_data['warmup_time'] = warmup_time
         timing_data['mean_loop_time'] = loop_time
         timing_data['mean_per_iter_time'] = per_iter_time
@@ -135,16 +394,16 @@ def run_numbacs_predefined_ftle(
     results['metadata'] = metadata
             
     # Write to JSON
-    print(f"Saving results to: {output_json_path}")
+    logger.info(f"Saving results to: {output_json_path}")
     try:
         os.makedirs(os.path.dirname(output_json_path), exist_ok=True)
         with open(output_json_path, 'w') as f:
             json.dump(results, f, indent=2)
-            print("Results saved.")
+            logger.info("Results saved.")
     except IOError as e:
-        print(f"Error saving JSON: {e}")
+        logger.error(f"Error saving JSON: {e}")
         raise
-    print(f"--- {package} benchmark complete ---")
+    logger.info(f"--- {package} benchmark complete ---")
     
 
 def run_numbacs_data_ftle(
@@ -153,7 +412,11 @@ def run_numbacs_data_ftle(
         iterates_per_run, 
         num_benchmark_runs, 
         error_data={},
-        metadata={}
+        metadata={},
+        vel_data=None,
+        vel_dtype=None,
+        num_workers=None,
+        reuse_buffers=False
 ):
     """
     Runs numbacs benchmark for double gyre flow
@@ -164,7 +427,7 @@ def run_numbacs_data_ftle(
         dict containing flow data with the following key-value pairs:
             'flow_str': str,
             'vel_data_paths': {"u": "/path_to/u_data.npy", "v": "/path_to/v_data.npy"}
-            'domain': ((float, float), (float, float), (float, float)) -- (tlims, xlims, ylims),
+            'domain': [float, float, float, float, float, float] -- [tmin, tmax, x0, x1, y0, y1],
             't0': float, 
             'T': float,
             'dt0': float
@@ -178,6 +441,25 @@ def run_numbacs_data_ftle(
         dict containing path to data for error computation and parameters. The default is {}.
     metadata : dict
         dict containing metadata for specific package/case. The default is {}.        
+    vel_data : (np.ndarray, np.ndarray) or None
+        already opened (e.g. memory-mapped) u, v velocity arrays with shape (nt, nx, ny).
+        If None, they are memory-mapped from flow_data['vel_data_paths']. The default is None.
+    vel_dtype : np.dtype or None
+        if given, the velocity data is cast to this dtype (e.g. np.float32) before the
+        interpolant is built. The spline coefficients are float64 regardless. The default
+        is None.
+    num_workers : int or None
+        if given, the benchmark runs are performed concurrently on up to num_workers
+        single threaded worker processes instead of one after the other with all numba
+        threads. Timings are then single thread timings. Requires numba's workqueue
+        threading layer (see use_fork_safe_threading_layer). The number of worker
+        processes actually used (None for runs in this process) is saved as
+        timings['num_workers']. The default is None.
+    reuse_buffers : bool
+        if True, the timed iterates use local versions of the numbacs flow map and FTLE
+        kernels (same solver settings) that reuse preallocated buffers and are compiled
+        for this grid size, otherwise numbacs' flowmap_grid_2D and ftle_grid_2D are
+        timed as shipped. The default is False.
 
     Returns
     -------
@@ -187,23 +469,36 @@ def run_numbacs_data_ftle(
     req_keys = {'flow_str', 'vel_data_paths', 'domain', 't0', 'T', 'dt0'}
     if not req_keys.issubset(flow_data.keys()):
         raise ValueError(f"The dict 'flow_data' must contain the following keys: {req_keys}")
-    u, v = (np.load(flow_data['vel_data_paths']['u']), np.load(flow_data['vel_data_paths']['v']))
-    domain = flow_data['domain']
+    if vel_data is None:
+        u, v = (
+            np.load(flow_data['vel_data_paths']['u'], mmap_mode='r'),
+            np.load(flow_data['vel_data_paths']['v'], mmap_mode='r')
+        )
+    else:
+        u, v = vel_data
+        del vel_data
+    if vel_dtype is not None:
+        u = np.asarray(u, dtype=vel_dtype)
+        v = np.asarray(v, dtype=vel_dtype)
+    tmin, tmax, x0, x1, y0, y1 = flow_data['domain']
     nt, nx, ny = u.shape
     t0 = flow_data['t0']
     T = flow_data['T']
     dt0 = flow_data['dt0']
     package = metadata['package_name']
     case = metadata['case_description']
-    print(f'--- {package} benchmark: {case} ---')
-    print(f'Output JSON: {output_json_path}')
-    print(f'Iterations per run: {iterates_per_run}')
-    print(f'Number of benchmark runs: {num_benchmark_runs}')
+    logger.info(f'--- {package} benchmark: {case} ---')
+    logger.info(f'Output JSON: {output_json_path}')
+    logger.info(f'Iterations per run: {iterates_per_run}')
+    logger.info(f'Number of benchmark runs: {num_benchmark_runs}')
+    if num_workers is not None:
+        _check_num_workers(num_workers)
+        _check_fork_safe_threading_layer()
 
     # Set up flow parameters
-    t = np.linspace(domain[0][0], domain[0][1], nt)
-    x = np.linspace(domain[1][0], domain[1][1], nx)
-    y = np.linspace(domain[2][0], domain[2][1], ny)
+    t = np.linspace(tmin, tmax, nt)
+    x = np.linspace(x0, x1, nx)
+    y = np.linspace(y0, y1, ny)
     dx = x[1] - x[0]
     dy = y[1] - y[0]
     params = np.array([copysign(1, T)]) 
@@ -216,49 +511,77 @@ def run_numbacs_data_ftle(
     timing_data = {}
     
     # Create interpolant
-    print("Creating interpolant...")
+    logger.info("Creating interpolant...")
     grid_vel, C_eval_u, C_eval_v = get_interp_arrays_2D(t, x, y, u, v)
+    # Only the coefficients are needed from here on, drop the velocity data (and the
+    # memory maps when nothing else references them) before timing
+    del u, v
     
     # Retrieve function pointer
     funcptr = get_flow_2D(grid_vel, C_eval_u, C_eval_v)
-    print("Interpolant created.")
+    logger.info("Interpolant created.")
+    
     
+    # Compile for these argument types (numbacs functions on an 8x8 corner of the grid,
+    # the batch driver with 0 iterates) so compilation is not part of the warm-up (or the
+    # error run), record it separately
+    logger.info("Compiling...")
+    c_start = time.perf_counter_ns()
+    flowmap = flowmap_grid_2D(funcptr, t0, T, x[:8], y[:8], params)
+    _ = ftle_grid_2D(flowmap, T, dx, dy)
+    batch_driver = _get_batch_driver(len(x), len(y)) if reuse_buffers else _batch_flowmap_ftle
+    _ = batch_driver(funcptr, t0, dt0, T, x, y, params, dx, dy, 0)
+    compile_time = (time.perf_counter_ns() - c_start)*1e-9
+    logger.info(f"Compilation completed, took {compile_time:.5f} seconds.")
     
     # First call and record warmup time
-    print("Starting warm-up...")
+    logger.info("Starting warm-up...")
     # Compute error from this warmup run if error_data supplied
     if error_data:
-        ftle_true = error_data['true_data']
+        # The MAE is only a diagnostic, compute it in float32 on C-contiguous arrays to
+        # halve the bytes read by the reduction
+        ftle_true = np.ascontiguousarray(error_data['true_data'], dtype=np.float32)
         t0_true = error_data['t0']
-        wu_start = time.perf_counter()
+        wu_start = time.perf_counter_ns()
         flowmap = flowmap_grid_2D(funcptr, t0_true, T, x, y, params)
         ftle_est = ftle_grid_2D(flowmap, T, dx, dy)
-        warmup_time = time.perf_counter() - wu_start
-        mae = MAE(ftle_true, ftle_est, edge=False)
+        warmup_time = (time.perf_counter_ns() - wu_start)*1e-9
+        mae = MAE(ftle_true, ftle_est.astype(np.float32, copy=False), edge=False)
         results['error'] = {'mae': mae, 'error_params': error_data['error_params']}
     else:
-        wu_start = time.perf_counter()
+        wu_start = time.perf_counter_ns()
         flowmap = flowmap_grid_2D(funcptr, t0, T, x, y, params)
         _ = ftle_grid_2D(flowmap, T, dx, dy)
-        warmup_time = time.perf_counter() - wu_start
-    print(f"Warm-up completed, took {warmup_time:.5f} seconds.")
+        warmup_time = (time.perf_counter_ns() - wu_start)*1e-9
+    logger.info(f"Warm-up completed, took {warmup_time:.5f} seconds.")
     
     # Benchmarks
     if num_benchmark_runs > 1:
-        loop_times = np.zeros(num_benchmark_runs, np.float64)
-        for i in range(num_benchmark_runs):
-            print(f"Starting benchmark run {i+1} of {num_benchmark_runs}...")
-            l_start = time.perf_counter()
-            for k in range(iterates_per_run):
-                flowmap = flowmap_grid_2D(funcptr, t0 + k*dt0, T, x, y, params)
-                _ = ftle_grid_2D(flowmap, T, dx, dy)
-            loop_time = time.perf_counter() - l_start
-            print(
-                f"Benchmark run {i+1} of {num_benchmark_runs} completed, "
-                f"took {loop_time:.5f} seconds."
+        # Integer tick counts, converted to seconds once after all runs. Start and end
+        # ticks are separate so the log calls between runs are not timed
+        batch_args = (funcptr, t0, dt0, T, x, y, params, dx, dy, iterates_per_run)
+        if num_workers is not None:
+            loop_times, workers_used = _parallel_loop_times(
+                batch_driver, batch_args, num_benchmark_runs, num_workers
             )
-            loop_times[i] = loop_time
+        else:
+            workers_used = None
+            start_ticks = np.empty(num_benchmark_runs, np.int64)
+            end_ticks = np.empty(num_benchmark_runs, np.int64)
+            for i in range(num_benchmark_runs):
+                logger.info(f"Starting benchmark run {i+1} of {num_benchmark_runs}...")
+                start_ticks[i] = time.perf_counter_ns()
+                _ = batch_driver(*batch_args)
+                end_ticks[i] = time.perf_counter_ns()
+                logger.info(
+                    f"Benchmark run {i+1} of {num_benchmark_runs} completed, "
+                    f"took {(end_ticks[i] - start_ticks[i])*1e-9:.5f} seconds."
+                )
+            loop_times = (end_ticks - start_ticks)*1e-9
         per_iter_times = loop_times/iterates_per_run
+        timing_data['num_workers'] = workers_used
+        timing_data['reuse_buffers'] = reuse_buffers
+        timing_data['compile_time'] = compile_time
         timing_data['warmup_time'] = warmup_time
         timing_data['loop_times'] = loop_times.tolist()
         timing_data['per_iter_times'] = per_iter_times.tolist()
@@ -269,17 +592,19 @@ def run_numbacs_data_ftle(
     elif num_benchmark_runs < 1:
         raise ValueError("num_benchmark_runs must be at least 1")
     else:
-        print("Starting benchmark run 1 of 1...")
-        l_start = time.perf_counter()
-        for k in range(iterates_per_run):
-            flowmap = flowmap_grid_2D(funcptr, t0 + k*dt0, T, x, y, params)
-            _ = ftle_grid_2D(flowmap, T, dx, dy)
-        loop_time = time.perf_counter() - l_start
-        print(
+        logger.info("Starting benchmark run 1 of 1...")
+        l_start = time.perf_counter_ns()
+        _ = batch_driver(funcptr, t0, dt0, T, x, y, params, dx, dy, iterates_per_run)
+        loop_time = (time.perf_counter_ns() - l_start)*1e-9
+        logger.info(
             f"Benchmark run 1 of 1 completed, "
             f"took {loop_time:.5f} seconds."
         )
         per_iter_time = loop_time/iterates_per_run
+        # A single run is always performed in this process
+        timing_data['num_workers'] = None
+        timing_data['reuse_buffers'] = reuse_buffers
+        timing_data['compile_time'] = compile_time
         timing_data['warmup_time'] = warmup_time
         timing_data['mean_loop_time'] = loop_time
         timing_data['mean_per_iter_time'] = per_iter_time
@@ -290,13 +615,13 @@ def run_numbacs_data_ftle(
     results['metadata'] = metadata
     
     # Write to JSON
-    print(f"Saving results to: {output_json_path}")
+    logger.info(f"Saving results to: {output_json_path}")
     try:
         os.makedirs(os.path.dirname(output_json_path), exist_ok=True)
         with open(output_json_path, 'w') as f:
             json.dump(results, f, indent=2)
-            print("Results saved.")
+            logger.info("Results saved.")
     except IOError as e:
-        print(f"Error saving JSON: {e}")
+        logger.error(f"Error saving JSON: {e}")
         raise
-    print(f"--- {package} benchmark complete ---")
\ No newline at end of file
+    logger.info(f"--- {package} benchmark complete ---")
\ No newline at end of file
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from numba import njit, prange
+
+# Fused error reductions used by benchmarks.utils. The 2D kernels take index bounds
+# [i0, i1) x [j0, j1) so edges can be excluded without slicing, the 1D kernels are used
+# for flattened arrays of any other dimension. All return the sum (not the mean).
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _abs_err_sum_2D(truth, est, i0, i1, j0, j1):
+    """Sum of |truth - est| over [i0, i1) x [j0, j1)"""
+    s = 0.0
+    for i in prange(i0, i1):
+        for j in range(j0, j1):
+            s += abs(truth[i, j] - est[i, j])
+
+    return s
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sq_err_sum_2D(truth, est, i0, i1, j0, j1):
+    """Sum of (truth - est)**2 over [i0, i1) x [j0, j1)"""
+    s = 0.0
+    for i in prange(i0, i1):
+        for j in range(j0, j1):
+            d = truth[i, j] - est[i, j]
+            s += d*d
+
+    return s
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sym_err_sum_2D(truth, est, i0, i1, j0, j1):
+    """Sum of |truth - est|/(truth + est) over [i0, i1) x [j0, j1)"""
+    s = 0.0
+    for i in prange(i0, i1):
+        for j in range(j0, j1):
+            s += abs(truth[i, j] - est[i, j])/(truth[i, j] + est[i, j])
+
+    return s
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _abs_err_sum_1D(truth, est):
+    """Sum of |truth - est| for flattened arrays"""
+    s = 0.0
+    for k in prange(truth.size):
+        s += abs(truth[k] - est[k])
+
+    return s
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sq_err_sum_1D(truth, est):
+    """Sum of (truth - est)**2 for flattened arrays"""
+    s = 0.0
+    for k in prange(truth.size):
+        d = truth[k] - est[k]
+        s += d*d
+
+    return s
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sym_err_sum_1D(truth, est):
+    """Sum of |truth - est|/(truth + est) for flattened arrays"""
+    s = 0.0
+    for k in prange(truth.size):
+        s += abs(truth[k] - est[k])/(truth[k] + est[k])
+
+    return s
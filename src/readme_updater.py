@@ -1,11 +1,16 @@
-import pandas as pd
 import json
-import glob
 import os
+import pickle
 import numpy as np
 import sys
 import re
 import argparse
+from pathlib import Path
+from collections import defaultdict
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
@@ -19,60 +24,303 @@ SPEEDUP_BASELINE_PACKAGE = "NumbaCS"
 
 BENCHMARK_SECTION_START_PLACEHOLDER = "<!-- BENCHMARK_RESULTS_START -->"
 BENCHMARK_SECTION_END_PLACEHOLDER = "<!-- BENCHMARK_RESULTS_END -->"
+# Matches the benchmark section (placeholders included), compiled once at import
+_PLACEHOLDER_RE = re.compile(
+    f"({re.escape(BENCHMARK_SECTION_START_PLACEHOLDER)})(.*?)"
+    f"({re.escape(BENCHMARK_SECTION_END_PLACEHOLDER)})", 
+    re.DOTALL
+)
 
+# Fields (columns) loaded from each results file, in record order
+RECORD_FIELDS = (
+    "package", "case_id", "case_description", "iterates_per_run",
+    "num_benchmark_runs", "mean_iter_s", "std_iter_s", "mae"
+)
+# Numeric fields are stored in typed arrays (others in lists)
+NUMERIC_FIELD_DTYPES = {
+    "iterates_per_run": np.int64, "num_benchmark_runs": np.int64,
+    "mean_iter_s": np.float64, "std_iter_s": np.float64, "mae": np.float64
+}
+# Parsed results cache, bump CACHE_VERSION when RECORD_FIELDS or parsing changes
+CACHE_FILENAME = ".cache.pkl"
+CACHE_VERSION = 3
+# Opt-in benchmark options as (results section, key). A run with any of them set (not
+# None/False) is labelled with them in the package column, e.g. "Dynlab (batched)" or
+# "NumbaCS (num_workers=4)", so it is not reported (or used as the speedup baseline) as
+# the package as shipped
+OPTION_KEYS = (
+    ("parameters", "jit_flow"), ("parameters", "batched"), ("parameters", "single_precision"),
+    ("timings", "num_workers"), ("timings", "reuse_buffers")
+)
+# Signature (newest mtime, file count) of the results files at the last README update
+SIG_FILENAME = ".last_sig"
 
-def load_benchmark_data(results_dir_path):
-    """Loads data from *_results.json files."""
-    all_data = []
-    json_files = glob.glob(os.path.join(results_dir_path, "*_results.json"))
+
+def _package_label(data):
+    """Package name of a parsed results file with any opt-in options set appended"""
+    options = []
+    for section, key in OPTION_KEYS:
+        value = data.get(section, {}).get(key)
+        if value is None or value is False:
+            continue
+        options.append(key if value is True else f"{key}={value}")
+    package = data["metadata"]["package_name"]
+    
+    return f"{package} ({', '.join(options)})" if options else package
+
+def _parse_result_file(f_path):
+    """Parses a *_results.json file into a record with the fields in RECORD_FIELDS"""
+    raw = Path(f_path).read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    metadata = data["metadata"]; params = data["parameters"]
+    timing_data = data["timings"]
+    
+    return (
+        _package_label(data),
+        metadata["case_id"],
+        metadata.get("case_description", metadata["case_id"].replace("_", " ").upper()),
+        int(params["iterates_per_run"]),
+        int(params["num_benchmark_runs"]),
+        float(timing_data["mean_per_iter_time"]),
+        float(timing_data.get("std_per_iter_time", np.nan)),
+        float(data.get("error_metrics", {}).get("mae", np.nan))
+    )
+
+def _results_signature(results_dir_path):
+    """
+    Returns (max mtime_ns, count) of the *_results.json files in results_dir_path, None
+    if there are none.
+    """
+    if not os.path.isdir(results_dir_path):
+        return None
+    mtimes = [
+        entry.stat().st_mtime_ns for entry in os.scandir(results_dir_path)
+        if entry.is_file() and entry.name.endswith("_results.json")
+    ]
+    if not mtimes:
+        return None
+    
+    return (max(mtimes), len(mtimes))
+
+def _read_signature(sig_path):
+    """Reads a signature written by _write_signature, None if missing or unreadable"""
+    try:
+        with open(sig_path, 'r') as f:
+            max_mtime_ns, count = f.read().split()
+        return (int(max_mtime_ns), int(count))
+    except (OSError, ValueError):
+        return None
+
+def _write_signature(sig_path, sig):
+    """Writes a results signature, failing to write it only disables the change check"""
+    try:
+        with open(sig_path, 'w') as f:
+            f.write(f"{sig[0]} {sig[1]}\n")
+    except OSError as e:
+        print(f"WARNING: Could not write results signature to '{sig_path}': {e}")
+
+def _load_cache(cache_path):
+    """Loads the {path: (mtime_ns, record)} parse cache, empty if missing or unreadable"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache["records"]
+    except Exception:
+        pass
+    
+    return {}
+
+def load_benchmark_data(results_dir_path, cache_path=None):
+    """
+    Loads data from *_results.json files. Parsed records are cached (keyed by file path
+    and modification time) in cache_path, default results_dir_path/.cache.pkl, so only
+    new or modified files are parsed on later calls. Returns a dict of columns (keys are
+    RECORD_FIELDS, numeric columns are np.ndarray, others lists), empty if nothing loaded.
+    """
+    if cache_path is None:
+        cache_path = os.path.join(results_dir_path, CACHE_FILENAME)
+    # A single directory scan, entries are filtered by name without extra stat calls
+    json_files = []
+    if os.path.isdir(results_dir_path):
+        with os.scandir(results_dir_path) as it:
+            json_files = [
+                (entry.path, entry.stat().st_mtime_ns) for entry in it 
+                if entry.name.endswith("_results.json") and "_error" not in entry.name.lower()
+            ]
     print(f"Found {len(json_files)} '*_results.json' files in '{results_dir_path}'.")
-    for f_path in json_files:
+    # Accumulate columns directly, numeric columns are preallocated typed arrays and a
+    # mask marks which files were loaded
+    n = len(json_files)
+    columns = {
+        field: np.empty(n, NUMERIC_FIELD_DTYPES[field]) if field in NUMERIC_FIELD_DTYPES else []
+        for field in RECORD_FIELDS
+    }
+    valid = np.zeros(n, dtype=bool)
+    cache = _load_cache(cache_path)
+    new_cache = {}
+    for i, (f_path, mtime_ns) in enumerate(json_files):
         filename = os.path.basename(f_path)
-        if "_error" in filename.lower():
-            continue
-        print(f"  Processing: {filename}")
+        cached = cache.get(f_path)
+        if cached is not None and cached[0] == mtime_ns:
+            record = cached[1]
+        else:
+            print(f"  Processing: {filename}")
+            try:
+                record = _parse_result_file(f_path)
+            except Exception as e:
+                print(f"    ERROR processing {filename}: {e}. Skipping.", file=sys.stderr)
+                continue
+        new_cache[f_path] = (mtime_ns, record)
+        valid[i] = True
+        for field, value in zip(RECORD_FIELDS, record):
+            if field in NUMERIC_FIELD_DTYPES:
+                columns[field][i] = value
+            else:
+                columns[field].append(value)
+    if new_cache != cache and os.path.isdir(results_dir_path):
         try:
-            with open(f_path, 'r', encoding='utf-8') as f: 
-                data = json.load(f)
-            metadata = data["metadata"]; params = data["parameters"]
-            timing_data = data["timings"]
-            record = {
-                "package": metadata["package_name"], 
-                "case_id": metadata["case_id"],
-                "case_description": metadata.get(
-                    "case_description", metadata["case_id"].replace("_", " ").upper()
-                ),
-                "iterates_per_run": int(params["iterates_per_run"]),
-                "num_benchmark_runs": int(params["num_benchmark_runs"]),
-                "mean_iter_s": float(timing_data["mean_per_iter_time"]),
-                "std_iter_s": float(timing_data.get("std_per_iter_time", np.nan)),
-                "mae": float(data.get("error_metrics", {}).get("mae", np.nan))
-            }
-            all_data.append(record)
-        except Exception as e:
-            print(f"    ERROR processing {filename}: {e}. Skipping.", file=sys.stderr)
-    if not all_data: 
+            with open(cache_path, 'wb') as f:
+                pickle.dump({"version": CACHE_VERSION, "records": new_cache}, f)
+        except OSError as e:
+            print(f"WARNING: Could not write cache '{cache_path}': {e}", file=sys.stderr)
+    if not valid.any(): 
         print("WARNING: No valid benchmark data loaded.")
+        return {}
+    for field in NUMERIC_FIELD_DTYPES:
+        columns[field] = columns[field][valid]
         
-    return pd.DataFrame(all_data) if all_data else pd.DataFrame()
+    return columns
 
 def _speedup_col_fmt(speedup):
     """
-    Formats the speedup column so speedup appears normally and slowdown
-    appears as (1/speedup)^{-1}
+    Formats the speedup column (array-like) so speedup appears normally and slowdown
+    appears as (1/speedup)^{-1}. Cells are selected with masks instead of branching
+    per cell, missing or non-positive speedups appear as N/A.
     """
-    if pd.notnull(speedup) and speedup >= 1.0:
-        return f"{speedup:.2f}"
-    elif pd.notnull(speedup) and 0.0 < speedup < 1.0:        
-        return f"({1/speedup:.2f})\u207B\u00B9"
-    else:
-        return "N/A"
+    speedup = np.asarray(speedup, dtype=np.float64)
+    formatted = np.full(speedup.shape, "N/A", dtype=object)
+    faster = speedup >= 1.0
+    slower = (speedup > 0.0) & (speedup < 1.0)
+    formatted[faster] = [f"{s:.2f}" for s in speedup[faster]]
+    formatted[slower] = [f"({s:.2f})\u207B\u00B9" for s in 1/speedup[slower]]
+    
+    return formatted
+
+def _num_col_fmt(values, fmt):
+    """Formats a numeric column (array-like) with fmt, missing values appear as N/A"""
+    values = np.asarray(values, dtype=np.float64)
+    formatted = np.full(values.shape, "N/A", dtype=object)
+    valid = ~np.isnan(values)
+    formatted[valid] = [fmt.format(v) for v in values[valid]]
     
-def generate_md_tables(df, output_dir):
+    return formatted
+    
+def _md_table(table_cols):
+    """
+    Builds a markdown (pipe) table from a list of (header, cells, right_align) columns,
+    cells are already formatted strings.
+    """
+    widths = [max(len(header), *(len(c) for c in cells)) for header, cells, _ in table_cols]
+    def _row(cells):
+        return "| " + " | ".join(
+            c.rjust(w) if right else c.ljust(w) 
+            for c, w, (_, _, right) in zip(cells, widths, table_cols)
+        ) + " |"
+    lines = [_row([header for header, _, _ in table_cols])]
+    lines.append("|" + "|".join(
+        "-"*(w + 1) + ":" if right else ":" + "-"*(w + 1) 
+        for w, (_, _, right) in zip(widths, table_cols)
+    ) + "|")
+    for i in range(len(table_cols[0][1])):
+        lines.append(_row([cells[i] for _, cells, _ in table_cols]))
+        
+    return "\n".join(lines)
+
+def _write_case_md(case_id, case_markdown, output_dir):
+    """Writes the markdown for a case, returns the file path or None if it failed"""
+    file_path = os.path.join(output_dir, f"{case_id}_benchmark_section.md")
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f_out:
+            f_out.write(case_markdown)
+        print(f"  Saved case table: {file_path}")
+        return file_path
+    except IOError as e:
+        print(
+            f"  ERROR: Could not write table for {case_id} to {file_path}: {e}", 
+            file=sys.stderr
+        )
+        return None
+
+def generate_md_tables(data, output_dir):
     """
-    Generates a markdown file (Header + Table) for each case and saves it.
+    Generates a markdown file (Header + Table) for each case and saves it, tables are
+    assembled directly from the columns returned by load_benchmark_data.
     Returns a list of file paths to the generated .md files, sorted by case_id.
     """
+    if not data:
+        return []
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"Created directory for cases: {output_dir}")
+
+    # Row indices of each case
+    case_rows = defaultdict(list)
+    for i, case_id in enumerate(data["case_id"]):
+        case_rows[case_id].append(i)
+
+    generated_file_paths = []
+    for case_id in sorted(case_rows):
+        rows = case_rows[case_id]
+        print(f"\nGenerating markdown for case: {case_id}")
+        
+        iter_p_run = data["iterates_per_run"][rows[0]]
+        num_b_runs = data["num_benchmark_runs"][rows[0]]
+        case_desc = data["case_description"][rows[0]]
+        
+        header_line = f"### {case_desc} (Iter/Run: {iter_p_run}, Num Runs: {num_b_runs})"
+        
+        # --- Prepare table data, (header, formatted cells, right aligned) columns ---
+        packages = [data["package"][i] for i in rows]
+        mean_iter = data["mean_iter_s"][rows]
+        std_iter = data["std_iter_s"][rows]
+        mae = data["mae"][rows]
+        table_cols = [
+            ("Package", packages, False), 
+            ("Mean /Iter (s)", _num_col_fmt(mean_iter, "{:.4f}"), True)
+        ]
+        if num_b_runs > 1 and not np.isnan(std_iter).all():
+            table_cols.append(("Std /Iter (s)", _num_col_fmt(std_iter, "{:.4f}"), True))
+        speedup = np.full(len(rows), np.nan)
+        if SPEEDUP_BASELINE_PACKAGE in packages:
+            baseline_time = mean_iter[packages.index(SPEEDUP_BASELINE_PACKAGE)]
+            if baseline_time > 0:
+                with np.errstate(divide='ignore'):
+                    speedup = baseline_time/mean_iter
+        table_cols.append(
+            (f"Speedup (vs {SPEEDUP_BASELINE_PACKAGE})", _speedup_col_fmt(speedup), False)
+        )
+        if not np.isnan(mae).all():
+            table_cols.append(("MAE", _num_col_fmt(mae, "{:.3e}"), True))
+        case_table_md = _md_table(table_cols)
+        # --- End Table Preparation ---
+
+        file_path = _write_case_md(case_id, f"{header_line}\n\n{case_table_md}", output_dir)
+        if file_path is not None:
+            generated_file_paths.append(file_path)
+            
+    return generated_file_paths
+
+def generate_md_tables_rich(data, output_dir):
+    """
+    pandas/tabulate version of generate_md_tables (used with --rich), the tables are
+    rendered with DataFrame.to_markdown. Returns a list of file paths to the generated
+    .md files, sorted by case_id.
+    """
+    import pandas as pd
+    
+    df = pd.DataFrame(data)
     if df.empty:
         return []
 
@@ -84,7 +332,7 @@ def generate_md_tables(df, output_dir):
     sorted_case_ids = sorted(df["case_id"].unique())
 
     for case_id in sorted_case_ids:
-        group = df[df["case_id"] == case_id].copy()
+        group = df[df["case_id"] == case_id]
         if group.empty:
             continue
 
@@ -97,65 +345,36 @@ def generate_md_tables(df, output_dir):
         header_line = f"### {case_desc} (Iter/Run: {iter_p_run}, Num Runs: {num_b_runs})"
         
         # --- Prepare table data ---
-        table_data = group[["package", "mean_iter_s"]].copy()
-        table_data.rename(
-            columns={"package": "Package", "mean_iter_s": "Mean /Iter (s)"}, inplace=True
-        )
+        # Columns are taken as arrays from the group (no DataFrame copies), only the
+        # formatted string columns are newly built, insertion order is the column order
+        mean_iter = group["mean_iter_s"].to_numpy()
+        table_data = {
+            "Package": group["package"].to_numpy(), 
+            "Mean /Iter (s)": _num_col_fmt(mean_iter, "{:.4f}")
+        }
         if num_b_runs > 1 and 'std_iter_s' in group.columns and group['std_iter_s'].notna().any():
-            table_data["Std /Iter (s)"] = group["std_iter_s"]
-        if 'mae' in group.columns and group['mae'].notna().any():
-            table_data["MAE"] = group["mae"]
+            table_data["Std /Iter (s)"] = _num_col_fmt(group["std_iter_s"].to_numpy(), "{:.4f}")
         speedup_col_name = f"Speedup (vs {SPEEDUP_BASELINE_PACKAGE})"
-        baseline_row = group[group["package"] == SPEEDUP_BASELINE_PACKAGE]
-        if not baseline_row.empty:
-            baseline_time = baseline_row["mean_iter_s"].iloc[0]
+        speedup = np.full(len(group), np.nan)
+        baseline_mask = (group["package"] == SPEEDUP_BASELINE_PACKAGE).to_numpy()
+        if baseline_mask.any():
+            baseline_time = mean_iter[baseline_mask][0]
             if baseline_time > 0: 
-                table_data[speedup_col_name] = pd.to_numeric(
-                    baseline_time/group["mean_iter_s"], errors='coerce'
-                )
-            else: 
-                table_data[speedup_col_name] = np.nan
-        else: 
-            table_data[speedup_col_name] = np.nan
-        
-        desired_cols_order = ["Package", "Mean /Iter (s)"]
-        if "Std /Iter (s)" in table_data.columns: 
-            desired_cols_order.append("Std /Iter (s)")
-        if speedup_col_name in table_data.columns: 
-            desired_cols_order.append(speedup_col_name)
-        if "MAE" in table_data.columns: 
-            desired_cols_order.append("MAE")
-        current_cols = set(table_data.columns)
-        ordered_cols = [col for col in desired_cols_order if col in current_cols] \
-                       + [col for col in current_cols if col not in desired_cols_order]
-        table_data = table_data[ordered_cols]
-        formatters = {
-            "Mean /Iter (s)": "{:.4f}", "Std /Iter (s)": "{:.4f}", "MAE": "{:.3e}",
-            speedup_col_name: _speedup_col_fmt
-        }
-        for col, fmt in formatters.items():
-            if col in table_data.columns: 
-                table_data[col] = table_data[col].apply(
-                    fmt if callable(fmt) else lambda x, f=fmt: f.format(x) if pd.notnull(x) else 'N/A'
-                )
-        case_table_md = table_data.to_markdown(index=False)
+                with np.errstate(divide='ignore'):
+                    speedup = baseline_time/mean_iter
+        table_data[speedup_col_name] = _speedup_col_fmt(speedup)
+        if 'mae' in group.columns and group['mae'].notna().any():
+            table_data["MAE"] = _num_col_fmt(group["mae"].to_numpy(), "{:.3e}")
+        case_table_md = pd.DataFrame(table_data).to_markdown(index=False)
         # --- End Table Preparation ---
 
         # Combine header and table for this case
         case_full_markdown_name = f"{header_line}\n\n{case_table_md}"
         
         # Save to file
-        file_path = os.path.join(output_dir, f"{case_id}_benchmark_section.md")
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f_out:
-                f_out.write(case_full_markdown_name)
+        file_path = _write_case_md(case_id, case_full_markdown_name, output_dir)
+        if file_path is not None:
             generated_file_paths.append(file_path)
-            print(f"  Saved case table: {file_path}")
-        except IOError as e:
-            print(
-                f"  ERROR: Could not write table for {case_id} to {file_path}: {e}", 
-                file=sys.stderr
-            )
             
     return generated_file_paths
 
@@ -186,12 +405,7 @@ def assemble_and_update_readme(readme_filepath, sorted_table_filepaths):
         print(f"ERROR: README file not found at '{readme_filepath}'. Cannot update.", file=sys.stderr)
         return False
 
-    pattern = re.compile(
-        f"({re.escape(BENCHMARK_SECTION_START_PLACEHOLDER)})(.*?)"
-        f"({re.escape(BENCHMARK_SECTION_END_PLACEHOLDER)})", 
-        re.DOTALL
-    )
-    match = pattern.search(readme_text)
+    match = _PLACEHOLDER_RE.search(readme_text)
 
     if not match:
         print(
@@ -219,12 +433,6 @@ def assemble_and_update_readme(readme_filepath, sorted_table_filepaths):
 
 
 def main():
-    df_benchmarks = load_benchmark_data(RESULTS_DIR)
-    if df_benchmarks.empty:
-        print("No benchmark data processed.")
-        # Do nothing if no benchmark data found
-        return
-    
     parser = argparse.ArgumentParser(
         description="Default (no args): generate tables and update README.md, "
         + "tables-only: generate tables only"
@@ -237,12 +445,39 @@ def main():
         help="Pass 'tables-only' as arg to generate tables WITHOUT updating README.md, "
             + "otherwise README.md will be updated with generated tables."
         )
+    parser.add_argument(
+        "--rich",
+        action="store_true",
+        help="Render tables with pandas (DataFrame.to_markdown) instead of pure Python."
+        )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Update README.md even if no results file changed since the last update."
+        )
     args = parser.parse_args()
     
+    # Skip everything if no results file was added or modified since the last README update
+    sig_path = os.path.join(RESULTS_DIR, SIG_FILENAME)
+    results_sig = _results_signature(RESULTS_DIR)
+    if (
+        args.mode == "all" and not args.force and results_sig is not None 
+        and results_sig == _read_signature(sig_path)
+    ):
+        print(f"{__file__}: No changes in results since the last update (use --force to update).")
+        return
+    
+    benchmark_data = load_benchmark_data(RESULTS_DIR)
+    if not benchmark_data:
+        print("No benchmark data processed.")
+        # Do nothing if no benchmark data found
+        return
+    table_fn = generate_md_tables_rich if args.rich else generate_md_tables
+    
     if args.mode == "tables-only":
         print(f"{__file__}: Starting benchmark reporting (generating tables for each case)...")
         # Generate and save .md file for each case (Header + Table)
-        case_table_filepaths = generate_md_tables(df_benchmarks, MARKDOWN_DIR)
+        case_table_filepaths = table_fn(benchmark_data, MARKDOWN_DIR)
         if not case_table_filepaths:
             print("No individual case markdown files were generated.")
             return
@@ -251,7 +486,7 @@ def main():
         print(f"{__file__}: Starting benchmark reporting (individual case files -> README section)...")
     
         # Generate and save .md file for each case (Header + Table)
-        case_table_filepaths = generate_md_tables(df_benchmarks, MARKDOWN_DIR)
+        case_table_filepaths = table_fn(benchmark_data, MARKDOWN_DIR)
         
         if not case_table_filepaths:
             print("No individual case markdown files were generated.")
@@ -259,7 +494,8 @@ def main():
             return
     
         # Assemble content from these files and update the README's master benchmark section
-        assemble_and_update_readme(README_FILE, case_table_filepaths)
+        if assemble_and_update_readme(README_FILE, case_table_filepaths) and results_sig is not None:
+            _write_signature(sig_path, results_sig)
         
         print(f"{__file__}: Process complete.")
 